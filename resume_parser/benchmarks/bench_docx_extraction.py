@@ -0,0 +1,70 @@
+'''
+Benchmark the streaming DOCX extractor against the previous `docx2txt`
+based one: time per file and peak Python allocations (tracemalloc), and
+check both return the same text.
+
+Usage (from the `resume_parser/` directory):
+
+    python -m benchmarks.bench_docx_extraction out/corpus [--repeat 3]
+
+The corpus is generated with the default settings when the directory does
+not exist. Differences are expected for documents with headers or footers,
+which the streaming extractor does not read.
+'''
+
+import argparse
+import os
+import timeit
+import tracemalloc
+
+import docx2txt
+
+from benchmarks.bench_model_registry import collect_resumes
+from resume_parser import utils
+
+
+def docx2txt_text(path):
+    temp = docx2txt.process(path)
+    return ' '.join(line.replace('\t', ' ') for line in temp.split('\n') if line)
+
+
+def peak_allocations(func, path):
+    tracemalloc.start()
+    func(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('directory', help="corpus directory, generated when missing")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.directory):
+        from benchmarks.corpus import generate_corpus
+        generate_corpus(args.directory)
+    documents = [path for path in collect_resumes(args.directory) if path.endswith('.docx')]
+    if not documents:
+        print('No .docx files found in {}'.format(args.directory))
+        return
+
+    totals = {'docx2txt': [0.0, 0], 'streaming': [0.0, 0]}
+    mismatches = 0
+    for path in documents:
+        # the streaming extractor keeps one paragraph per line, compare the words
+        if docx2txt_text(path).split() != utils.extract_text_from_doc(path).split():
+            mismatches += 1
+        for label, func in (('docx2txt', docx2txt_text), ('streaming', utils.extract_text_from_doc)):
+            totals[label][0] += min(timeit.repeat(lambda: func(path), number=1, repeat=args.repeat))
+            totals[label][1] = max(totals[label][1], peak_allocations(func, path))
+
+    for label, (seconds, peak) in totals.items():
+        print('{:<10} {:8.2f}ms/file  peak={:8.1f}KB'.format(label, seconds * 1000 / len(documents), peak / 1024))
+    print('speedup {:.1f}x over {} files, {} with different text'.format(
+        totals['docx2txt'][0] / totals['streaming'][0], len(documents), mismatches))
+
+
+if __name__ == '__main__':
+    main()
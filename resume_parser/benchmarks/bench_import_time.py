@@ -0,0 +1,79 @@
+'''
+Import-time benchmark and guard: runs each target in a fresh interpreter with
+`python -X importtime` and reports the total import time, the slowest
+top-level imports and whether the parsing stack (spaCy, NLTK, pdfminer,
+pandas) was loaded.
+
+Usage (from the `resume_parser/` directory):
+
+    python -m benchmarks.bench_import_time [--check] [--top 5]
+
+With `--check` the command exits with status 1 when a target that must stay
+light (Django setup, URL conf, WSGI app) imports the parsing stack.
+'''
+
+import argparse
+import os
+import subprocess
+import sys
+
+# modules that only the parser should need
+HEAVY_MODULES = ('spacy', 'thinc', 'nltk', 'pdfminer', 'pandas')
+
+SETUP = 'import django; django.setup(); '
+
+# name -> (code run in the fresh interpreter, whether it may load the parsing stack)
+TARGETS = {
+    'django.setup (manage.py)': (SETUP, False),
+    'url conf (views)': (SETUP + 'import resume_parser.urls', False),
+    'wsgi app': ('import resume_parser.wsgi', False),
+    'parse_cache / parsing': (SETUP + 'import parser_app.parsing', False),
+    'ResumeParser': ('import resume_parser.resume_parser', True),
+}
+
+
+def import_times(code):
+    '''
+    :return: list of (module, cumulative microseconds, nesting level) in import order
+    '''
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='resume_parser.settings')
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    if completed.returncode:
+        raise RuntimeError('{!r} failed:\n{}'.format(code, completed.stderr[-2000:]))
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        level = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(cumulative), level))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--check', action='store_true', help="fail if a light target imports the parsing stack")
+    parser.add_argument('--top', type=int, default=5, help="slowest top-level imports to list per target")
+    args = parser.parse_args()
+
+    failures = []
+    for label, (code, heavy_allowed) in TARGETS.items():
+        entries = import_times(code)
+        top_level = [entry for entry in entries if entry[2] == 0]
+        total = sum(cumulative for name, cumulative, level in top_level)
+        heavy = sorted({name.split('.')[0] for name, cumulative, level in entries
+                        if name.split('.')[0] in HEAVY_MODULES})
+        print('{:<28} {:8.1f}ms  parsing stack: {}'.format(label, total / 1000, ', '.join(heavy) or '-'))
+        for name, cumulative, level in sorted(top_level, key=lambda entry: -entry[1])[:args.top]:
+            print('    {:<40} {:8.1f}ms'.format(name, cumulative / 1000))
+        if heavy and not heavy_allowed:
+            failures.append(label)
+
+    if args.check and failures:
+        print('Parsing stack imported by: {}'.format(', '.join(failures)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
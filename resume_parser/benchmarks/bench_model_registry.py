@@ -0,0 +1,66 @@
+'''
+Compare per-resume latency with a cold spaCy load per resume (the old
+`ResumeParser` behaviour) against the process-wide `nlp_registry`.
+
+Usage (from the `resume_parser/` directory):
+
+    python -m benchmarks.bench_model_registry path/to/resumes [--rounds 3]
+'''
+
+import argparse
+import os
+import statistics
+import time
+
+from resume_parser import nlp_registry
+from resume_parser.resume_parser import ResumeParser
+
+
+def collect_resumes(directory):
+    resumes = []
+    for root, directories, filenames in os.walk(directory):
+        for filename in filenames:
+            if os.path.splitext(filename)[1] in ('.pdf', '.docx', '.doc'):
+                resumes.append(os.path.join(root, filename))
+    return sorted(resumes)
+
+
+def time_parse(resumes, cold):
+    timings = []
+    for resume in resumes:
+        if cold:
+            nlp_registry.clear()
+        start = time.perf_counter()
+        ResumeParser(resume).get_extracted_data()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print('{:<10} n={:<5} mean={:8.1f}ms  median={:8.1f}ms  p95={:8.1f}ms'.format(
+        label, len(timings),
+        statistics.mean(timings) * 1000,
+        statistics.median(timings) * 1000,
+        p95 * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('directory', help="directory containing the resumes to parse")
+    parser.add_argument('--rounds', type=int, default=1, help="number of passes over the directory")
+    args = parser.parse_args()
+
+    resumes = collect_resumes(args.directory) * args.rounds
+    if not resumes:
+        print('No resumes found in {}'.format(args.directory))
+        return
+
+    report('cold', time_parse(resumes, cold=True))
+    nlp_registry.warm_up()
+    report('registry', time_parse(resumes, cold=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+'''
+Microbenchmark for competency / measurable-result extraction: the old
+per-phrase `string_found` loop against the single-pass `PhraseLexicon`.
+
+Usage (from the `resume_parser/` directory):
+
+    python -m benchmarks.bench_phrase_matching [--words 20000] [--repeat 5]
+'''
+
+import argparse
+import random
+import timeit
+
+from resume_parser import constants as cs
+from resume_parser import utils
+
+
+def per_phrase_loop(lexicon, text):
+    matches = {}
+    for category in lexicon.keys():
+        for item in lexicon[category]:
+            if utils.string_found(item, text):
+                matches.setdefault(category, []).append(item)
+    return matches
+
+
+def synthetic_experience(words, seed=0):
+    random.seed(seed)
+    vocabulary = [phrase for lexicon in (cs.COMPETENCIES, cs.MEASURABLE_RESULTS)
+                  for phrases in lexicon.values() for phrase in phrases]
+    filler = ['développé', 'application', 'client', 'équipe', 'projet', 'the', 'and', '2021', 'Casablanca']
+    return ' '.join(random.choice(vocabulary) if random.random() < 0.05 else random.choice(filler)
+                    for _ in range(words))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--words', type=int, default=20000, help="size of the synthetic experience section")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = synthetic_experience(args.words)
+    for label, lexicon, compiled in (('competencies', cs.COMPETENCIES, utils.COMPETENCIES_LEXICONS['en']),
+                                     ('measurable_results', cs.MEASURABLE_RESULTS, utils.MEASURABLE_RESULTS_LEXICONS['en'])):
+        assert per_phrase_loop(lexicon, text) == compiled.find(text)
+        before = min(timeit.repeat(lambda: per_phrase_loop(lexicon, text), number=1, repeat=args.repeat))
+        after = min(timeit.repeat(lambda: compiled.find(text), number=1, repeat=args.repeat))
+        print('{:<20} loop={:8.2f}ms  single-pass={:8.2f}ms  speedup={:5.1f}x'.format(
+            label, before * 1000, after * 1000, before / after))
+
+
+if __name__ == '__main__':
+    main()
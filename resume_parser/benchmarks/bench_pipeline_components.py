@@ -0,0 +1,41 @@
+'''
+Report where spaCy Doc construction time goes, per component and per
+parsing profile (see `nlp_registry.PROFILES`).
+
+Usage (from the `resume_parser/` directory):
+
+    python -m benchmarks.bench_pipeline_components path/to/resumes
+'''
+
+import argparse
+import os
+
+from resume_parser import nlp_registry
+from resume_parser import utils
+from benchmarks.bench_model_registry import collect_resumes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('directory', help="directory containing the resumes to profile")
+    args = parser.parse_args()
+
+    texts = [' '.join(utils.extract_text(resume, os.path.splitext(resume)[1]).split())
+             for resume in collect_resumes(args.directory)]
+    if not texts:
+        print('No resumes found in {}'.format(args.directory))
+        return
+
+    nlp_registry.warm_up()
+    print('{} resumes, {} characters'.format(len(texts), sum(len(text) for text in texts)))
+    for profile in nlp_registry.PROFILES:
+        costs = nlp_registry.component_costs(texts, profile=profile)
+        total = sum(seconds for name, seconds in costs)
+        print('\nprofile {!r}: {:.1f}ms per resume'.format(profile, total * 1000 / len(texts)))
+        for name, seconds in costs:
+            print('  {:<12} {:8.1f}ms per resume  {:5.1f}%'.format(
+                name, seconds * 1000 / len(texts), 100 * seconds / total if total else 0))
+
+
+if __name__ == '__main__':
+    main()
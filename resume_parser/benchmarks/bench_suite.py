@@ -0,0 +1,199 @@
+'''
+Parser benchmark suite: throughput, latency percentiles and peak RSS of
+`utils.extract_text`, each `utils.extract_*` function and the full
+`ResumeParser` over a corpus (see `benchmarks/corpus.py`). Results are
+written as JSON so two commits can be compared.
+
+Usage (from the `resume_parser/` directory):
+
+    python -m benchmarks.bench_suite out/corpus -o out/bench.json [--baseline old.json]
+
+The corpus is generated with the default settings when the directory does
+not exist. Every group of targets runs in a fresh process so the peak RSS
+of text extraction is not inflated by the spaCy model.
+'''
+
+import argparse
+import datetime
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_model_registry import collect_resumes
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _stats(timings, extra=None):
+    timings = sorted(timings)
+    total = sum(timings)
+
+    def percentile(p):
+        return timings[min(len(timings) - 1, int(round(p / 100 * (len(timings) - 1))))] * 1000
+
+    stats = {
+        'n': len(timings),
+        'throughput_per_s': len(timings) / total if total else None,
+        'mean_ms': total * 1000 / len(timings),
+        'p50_ms': percentile(50),
+        'p90_ms': percentile(90),
+        'p99_ms': percentile(99),
+        'max_ms': timings[-1] * 1000,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+    stats.update(extra or {})
+    return stats
+
+
+def _time(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def bench_extract_text(resumes):
+    from resume_parser import utils
+
+    timings = [_time(utils.extract_text, resume, os.path.splitext(resume)[1]) for resume in resumes]
+    return {'extract_text': _stats(timings)}
+
+
+def bench_extractors(resumes):
+    from resume_parser import nlp_registry
+    from resume_parser import utils
+    from resume_parser.language import detect_language, model_for
+
+    nlp_registry.warm_up()
+    utils.experience_stopwords()
+
+    inputs = []
+    for resume in resumes:
+        text_raw = utils.extract_text(resume, os.path.splitext(resume)[1])
+        text = ' '.join(text_raw.split())
+        doc = nlp_registry.process(text, model=model_for(detect_language(text)))
+        sections = utils.extract_entity_sections(text_raw)
+        inputs.append((text_raw, text, doc, sections.get('experience', [])))
+
+    targets = [
+        ('extract_entity_sections', lambda text_raw, text, doc, experience: utils.extract_entity_sections(text_raw)),
+        ('extract_email', lambda text_raw, text, doc, experience: utils.extract_email(text)),
+        ('extract_mobile_number', lambda text_raw, text, doc, experience: utils.extract_mobile_number(text)),
+        ('extract_name', lambda text_raw, text, doc, experience: utils.extract_name(
+            doc, matcher=nlp_registry.get_matcher(model_for(doc.lang_)))),
+        ('extract_skills', lambda text_raw, text, doc, experience: utils.extract_skills(doc, list(doc.noun_chunks))),
+        ('extract_education_keywords', lambda text_raw, text, doc, experience: utils.extract_education_keywords(
+            [sent.string.strip() for sent in doc.sents])),
+        ('extract_experience', lambda text_raw, text, doc, experience: utils.extract_experience(text, doc.lang_)),
+        ('extract_experience_from_doc', lambda text_raw, text, doc, experience: utils.extract_experience_from_doc(doc)),
+        ('extract_competencies', lambda text_raw, text, doc, experience: utils.extract_competencies(
+            text_raw, experience, doc.lang_)),
+        ('extract_measurable_results', lambda text_raw, text, doc, experience: utils.extract_measurable_results(
+            text_raw, experience, doc.lang_)),
+    ]
+    return {name: _stats([_time(target, *args) for args in inputs]) for name, target in targets}
+
+
+def bench_resume_parser(resumes):
+    from resume_parser import nlp_registry
+    from resume_parser.resume_parser import ResumeParser
+
+    nlp_registry.warm_up()
+    timings = [_time(ResumeParser, resume) for resume in resumes]
+    return {'ResumeParser': _stats(timings)}
+
+
+GROUPS = [bench_extract_text, bench_extractors, bench_resume_parser]
+
+
+def _run_group(group, resumes, queue):
+    queue.put(group(resumes))
+
+
+def run(resumes):
+    results = {}
+    context = mp.get_context('spawn')
+    for group in GROUPS:
+        queue = context.Queue()
+        process = context.Process(target=_run_group, args=(group, resumes, queue))
+        process.start()
+        results.update(queue.get())
+        process.join()
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    '''
+    :return: list of (target, metric, baseline, current) that regressed by more than `threshold`
+    '''
+    regressions = []
+    for target, stats in results.items():
+        previous = baseline.get('results', {}).get(target)
+        if not previous:
+            continue
+        for metric in ('p50_ms', 'p99_ms', 'peak_rss_mb'):
+            if previous.get(metric) and stats[metric] > previous[metric] * (1 + threshold):
+                regressions.append((target, metric, previous[metric], stats[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('directory', help="corpus directory, generated when missing")
+    parser.add_argument('-o', '--output', default='bench.json', help="where to write the JSON results")
+    parser.add_argument('--baseline', help="previous results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.directory):
+        from benchmarks.corpus import generate_corpus
+        generate_corpus(args.directory)
+    resumes = collect_resumes(args.directory)
+    if not resumes:
+        print('No resumes found in {}'.format(args.directory))
+        return
+
+    from resume_parser.version import PARSER_VERSION
+
+    report = {
+        'commit': _git_commit(),
+        'parser_version': PARSER_VERSION,
+        'python': platform.python_version(),
+        'date': datetime.datetime.utcnow().isoformat() + 'Z',
+        'corpus': {'directory': args.directory, 'files': len(resumes),
+                   'bytes': sum(os.path.getsize(resume) for resume in resumes)},
+        'results': run(resumes),
+    }
+    with open(args.output, 'w') as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+
+    for target, stats in report['results'].items():
+        print('{:<30} {:8.1f}/s  p50={:8.2f}ms  p99={:8.2f}ms  rss={:7.1f}MB'.format(
+            target, stats['throughput_per_s'] or 0, stats['p50_ms'], stats['p99_ms'], stats['peak_rss_mb']))
+    print('Wrote {}'.format(args.output))
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(report['results'], json.load(fh), args.threshold)
+        for target, metric, previous, current in regressions:
+            print('REGRESSION {} {}: {:.2f} -> {:.2f}'.format(target, metric, previous, current))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+'''
+Memory per gunicorn worker and cold-start time of the production profile
+(`gunicorn.conf.py`).
+
+For every process the private (USS) and proportional (PSS) set sizes are
+read from /proc (Linux only). With preloading, the pages of the Django app
+(and, with `--preload-nlp`, of the spaCy models) are shared with the master,
+so a worker's USS stays small while its RSS still counts them.
+
+Usage (from the `resume_parser/` directory):
+
+    # start gunicorn, wait for the workers to boot, measure, stop it
+    python -m benchmarks.bench_worker_memory --spawn [--workers 4] [--no-preload | --preload-nlp]
+
+    # measure a running server
+    python -m benchmarks.bench_worker_memory --pid <master pid>
+'''
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+
+def memory_kb(pid):
+    '''
+    :return: dictionary of `rss`, `pss` and `uss` in KB
+    '''
+    fields = {}
+    path = '/proc/{}/smaps_rollup'.format(pid)
+    if not os.path.exists(path):
+        path = '/proc/{}/smaps'.format(pid)
+    with open(path) as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = fields.get(parts[0].rstrip(':'), 0) + int(parts[1])
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+
+def children(pid):
+    with open('/proc/{0}/task/{0}/children'.format(pid)) as fh:
+        return [int(child) for child in fh.read().split()]
+
+
+def report(master):
+    rows = [('master', master)] + [('worker', pid) for pid in children(master)]
+    total_pss = 0
+    print('{:<8} {:>8} {:>10} {:>10} {:>10}'.format('process', 'pid', 'RSS MB', 'PSS MB', 'USS MB'))
+    for label, pid in rows:
+        memory = memory_kb(pid)
+        total_pss += memory['pss']
+        print('{:<8} {:>8} {:>10.1f} {:>10.1f} {:>10.1f}'.format(
+            label, pid, memory['rss'] / 1024, memory['pss'] / 1024, memory['uss'] / 1024))
+    print('total PSS: {:.1f} MB for {} workers'.format(total_pss / 1024, len(rows) - 1))
+
+
+def spawn(workers, preload, preload_nlp, timeout):
+    env = dict(os.environ, GUNICORN_WORKERS=str(workers), GUNICORN_PRELOAD='1' if preload else '0',
+               GUNICORN_PRELOAD_NLP='1' if preload_nlp else '0')
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                               'resume_parser.wsgi:application'], env=env)
+    try:
+        # a worker counts as booted once it has loaded the app, i.e. its
+        # memory stops growing; poll until every worker is up and stable
+        previous = None
+        while time.perf_counter() - started < timeout:
+            time.sleep(0.5)
+            pids = children(server.pid)
+            if len(pids) < workers:
+                continue
+            sizes = [memory_kb(pid)['rss'] for pid in pids]
+            if sizes == previous:
+                break
+            previous = sizes
+        print('cold start: {:.1f}s to {} booted workers (preload={}, preload_nlp={})'.format(
+            time.perf_counter() - started, workers, preload, preload_nlp))
+        report(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pid', type=int, help="pid of a running gunicorn master")
+    parser.add_argument('--spawn', action='store_true', help="start gunicorn with gunicorn.conf.py")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--no-preload', action='store_true')
+    parser.add_argument('--preload-nlp', action='store_true')
+    parser.add_argument('--timeout', type=float, default=300)
+    args = parser.parse_args()
+
+    if args.spawn:
+        spawn(args.workers, not args.no_preload, args.preload_nlp, args.timeout)
+    elif args.pid:
+        report(args.pid)
+    else:
+        parser.error('either --pid or --spawn is required')
+
+
+if __name__ == '__main__':
+    main()
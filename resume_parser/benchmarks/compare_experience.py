@@ -0,0 +1,58 @@
+'''
+Compare the spaCy-Doc experience extractor with the NLTK one on a corpus:
+agreement of the extracted chunks and time spent in each extractor.
+
+Usage (from the `resume_parser/` directory):
+
+    python -m benchmarks.compare_experience path/to/resumes
+'''
+
+import argparse
+import os
+import time
+
+from resume_parser import nlp_registry
+from resume_parser import utils
+from benchmarks.bench_model_registry import collect_resumes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('directory', help="directory containing the resumes to compare on")
+    args = parser.parse_args()
+
+    nlp = nlp_registry.get_nlp()
+    utils.experience_stopwords()
+
+    spacy_time = nltk_time = 0.0
+    identical = 0
+    overlap = []
+    resumes = collect_resumes(args.directory)
+    for resume in resumes:
+        text = ' '.join(utils.extract_text(resume, os.path.splitext(resume)[1]).split())
+        doc = nlp(text)
+
+        start = time.perf_counter()
+        from_doc = utils.extract_experience_from_doc(doc)
+        spacy_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        from_nltk = utils.extract_experience(text)
+        nltk_time += time.perf_counter() - start
+
+        a, b = set(from_doc), set(from_nltk)
+        identical += a == b
+        overlap.append(len(a & b) / len(a | b) if a | b else 1.0)
+
+    if not resumes:
+        print('No resumes found in {}'.format(args.directory))
+        return
+    print('resumes:           {}'.format(len(resumes)))
+    print('identical output:  {}'.format(identical))
+    print('mean jaccard:      {:.3f}'.format(sum(overlap) / len(overlap)))
+    print('spacy doc:         {:8.1f}ms total'.format(spacy_time * 1000))
+    print('nltk:              {:8.1f}ms total'.format(nltk_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
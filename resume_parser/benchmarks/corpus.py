@@ -0,0 +1,197 @@
+'''
+Synthetic resume corpus for the benchmarks: French and English PDF and DOCX
+resumes of controlled length, built from the vocabulary in
+`resume_parser/constants.py` and `skills.csv`. The writers are dependency
+free so the corpus can be generated anywhere the parser runs.
+
+Usage (from the `resume_parser/` directory):
+
+    python -m benchmarks.corpus out/corpus [--pages 1 2 5 10 20 40] [--per-size 3] [--seed 0]
+'''
+
+import argparse
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+from resume_parser import constants as cs
+from resume_parser.skills_index import SkillsIndex
+
+LINES_PER_PAGE = 48
+
+FIRST_NAMES = ['Yassine', 'Salma', 'Omar', 'Imane', 'Karim', 'Sara', 'Mehdi', 'Nadia', 'John', 'Emily']
+LAST_NAMES = ['El Amrani', 'Bennani', 'Alaoui', 'Tazi', 'Idrissi', 'Smith', 'Martin', 'Haddad']
+CITIES = ['Casablanca', 'Rabat', 'Marrakech', 'Tanger', 'Fès', 'Paris', 'London']
+COMPANIES = ['OCP Group', 'Maroc Telecom', 'Capgemini', 'CGI', 'Atos', 'Inwi', 'Société Générale']
+
+HEADERS = {
+    'fr': {'experience': 'Expérience professionnelle', 'education': 'Formation', 'skills': 'Compétences',
+           'projects': 'Projets', 'languages': 'Langues', 'interests': "Centres d'intérêt"},
+    'en': {'experience': 'Professional Experience', 'education': 'Education', 'skills': 'Skills',
+           'projects': 'Projects', 'languages': 'Languages', 'interests': 'Interests'},
+}
+FILLER = {
+    'fr': ['développement de', 'en charge de', 'au sein de', 'mise en place de', 'participation à',
+           'conception et réalisation de', 'une application', 'la plateforme', "l'équipe", 'le client'],
+    'en': ['development of', 'in charge of', 'as part of', 'rollout of', 'took part in',
+           'design and delivery of', 'an application', 'the platform', 'the team', 'the client'],
+}
+
+
+def resume_lines(pages, language, rng, skills):
+    '''
+    Lines of text for one resume of roughly `pages` pages
+    '''
+    headers = HEADERS[language]
+    name = '{} {}'.format(rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))
+    lines = [
+        name,
+        '{}@example.com'.format(name.lower().replace(' ', '.')),
+        '06 {:02d} {:02d} {:02d} {:02d}'.format(*(rng.randrange(100) for _ in range(4))),
+        rng.choice(CITIES),
+        '',
+        headers['education'],
+    ]
+    for _ in range(3):
+        lines.append('{} - {} ({})'.format(rng.choice(cs.EDUCATION), rng.choice(CITIES), rng.randrange(2005, 2024)))
+
+    lines += ['', headers['skills'], ', '.join(rng.sample(skills, min(12, len(skills))))]
+    lines += ['', headers['experience']]
+
+    competencies = [phrase.strip() for phrases in cs.COMPETENCIES.values() for phrase in phrases]
+    results = [phrase.strip() for phrases in cs.MEASURABLE_RESULTS.values() for phrase in phrases]
+    filler = FILLER[language]
+    while len(lines) < pages * LINES_PER_PAGE - 6:
+        year = rng.randrange(2008, 2024)
+        lines.append('{} - {} ({}-{})'.format(rng.choice(cs.JOB_TITLE), rng.choice(COMPANIES), year, year + rng.randrange(1, 4)))
+        for _ in range(rng.randrange(3, 7)):
+            lines.append('{} {} {} {} {}%'.format(
+                rng.choice(competencies), rng.choice(filler), rng.choice(skills),
+                rng.choice(results), rng.randrange(5, 60)))
+        lines.append('')
+
+    lines += [headers['languages'], 'Français, Anglais, Arabe' if language == 'fr' else 'French, English, Arabic',
+              '', headers['interests'], 'Football, lecture, voyages' if language == 'fr' else 'Football, reading, travel']
+    return lines
+
+
+def _pdf_string(line):
+    text = line.encode('cp1252', errors='replace')
+    return b'(' + text.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def write_pdf(path, lines):
+    '''
+    Minimal PDF 1.4 writer: Helvetica, WinAnsi encoding, `LINES_PER_PAGE` lines per page
+    '''
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,  # page tree, filled in once the page ids are known
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    page_ids = []
+    for page in pages:
+        stream = b'BT /F1 10 Tf 14 TL 50 800 Td ' + b''.join(_pdf_string(line) + b" '\n" for line in page) + b'ET'
+        objects.append(b'<< /Length ' + str(len(stream)).encode() + b' >>\nstream\n' + stream + b'\nendstream')
+        objects.append('<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> '
+                       '/Contents {} 0 R >>'.format(len(objects)).encode())
+        page_ids.append(len(objects))
+    objects[1] = '<< /Type /Pages /Kids [{}] /Count {} >>'.format(
+        ' '.join('{} 0 R'.format(i) for i in page_ids), len(page_ids)).encode()
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += str(number).encode() + b' 0 obj\n' + body + b'\nendobj\n'
+    xref = len(out)
+    out += 'xref\n0 {}\n0000000000 65535 f \n'.format(len(objects) + 1).encode()
+    out += b''.join('{:010d} 00000 n \n'.format(offset).encode() for offset in offsets)
+    out += 'trailer\n<< /Size {} /Root 1 0 R >>\nstartxref\n{}\n%%EOF\n'.format(len(objects) + 1, xref).encode()
+    with open(path, 'wb') as fh:
+        fh.write(out)
+
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def write_docx(path, lines):
+    '''
+    Minimal DOCX writer: one paragraph per line, a page break every `LINES_PER_PAGE` lines
+    '''
+    paragraphs = []
+    for number, line in enumerate(lines, 1):
+        run = '<w:r><w:t xml:space="preserve">{}</w:t></w:r>'.format(escape(line))
+        if number % LINES_PER_PAGE == 0:
+            run += '<w:r><w:br w:type="page"/></w:r>'
+        paragraphs.append('<w:p>{}</w:p>'.format(run))
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        '<w:body>{}</w:body></w:document>'
+    ).format(''.join(paragraphs))
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('[Content_Types].xml', DOCX_CONTENT_TYPES)
+        docx.writestr('_rels/.rels', DOCX_RELS)
+        docx.writestr('word/document.xml', document)
+
+
+WRITERS = {'pdf': write_pdf, 'docx': write_docx}
+
+
+def generate_corpus(directory, pages=(1, 2, 5, 10, 20, 40), languages=('fr', 'en'),
+                    formats=('pdf', 'docx'), per_size=3, seed=0):
+    '''
+    Write `per_size` resumes for every (pages, language, format) combination
+
+    :return: list of generated file paths
+    '''
+    rng = random.Random(seed)
+    skills = sorted(SkillsIndex.from_csv().skills)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for size in pages:
+        for language in languages:
+            for index in range(per_size):
+                lines = resume_lines(size, language, rng, skills)
+                for extension in formats:
+                    path = os.path.join(directory, '{}p_{}_{:02d}.{}'.format(size, language, index, extension))
+                    WRITERS[extension](path, lines)
+                    paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('directory', help="where to write the corpus")
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 2, 5, 10, 20, 40])
+    parser.add_argument('--languages', nargs='+', default=['fr', 'en'], choices=['fr', 'en'])
+    parser.add_argument('--formats', nargs='+', default=['pdf', 'docx'], choices=list(WRITERS))
+    parser.add_argument('--per-size', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.directory, args.pages, args.languages, args.formats, args.per_size, args.seed)
+    print('Wrote {} resumes to {}'.format(len(paths), args.directory))
+
+
+if __name__ == '__main__':
+    main()
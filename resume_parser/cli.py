@@ -1,11 +1,19 @@
 # Author: Omkar Pathak
 
 import os
+import sys
+import csv
+import json
+import time
 import argparse
 from pprint import pprint
-from resume_parser.resume_parser import ResumeParser
+from resume_parser import sandbox
+from resume_parser import metrics
 import multiprocessing as mp
 
+RESULT_FIELDS = ['file', 'error', 'name', 'email', 'mobile_number', 'skills', 'education',
+                 'experience', 'competencies', 'measurable_results']
+
 def print_cyan(text):
     print("\033[96m {}\033[00m" .format(text))
 
@@ -14,49 +22,138 @@ class ResumeParserCli(object):
         self.__parser = argparse.ArgumentParser()
         self.__parser.add_argument('-f', '--file', help="resume file to be extracted")
         self.__parser.add_argument('-d', '--directory', help="directory containing all the resumes to be extracted")
+        self.__parser.add_argument('-o', '--output',
+                                   help="stream results of a directory run to this .jsonl or .csv file instead of printing them")
+        self.__parser.add_argument('--format', choices=['jsonl', 'csv'],
+                                   help="output format, guessed from the --output extension by default")
+        self.__parser.add_argument('--manifest',
+                                   help="checkpoint file listing finished resumes (default: <output>.manifest)")
+        self.__parser.add_argument('--workers', type=int, default=mp.cpu_count(),
+                                   help="number of worker processes in directory mode")
+        self.__parser.add_argument('--timeout', type=int, default=sandbox.DEFAULT_TIMEOUT,
+                                   help="seconds allowed per resume before it is reported as failed (0 = no limit)")
+        self.__parser.add_argument('--memory-limit', type=int, default=sandbox.DEFAULT_MEMORY_LIMIT_MB,
+                                   help="address-space limit in MB of each parsing process (0 = no limit)")
+        self.__parser.add_argument('--max-tasks-per-child', type=int, default=sandbox.DEFAULT_MAX_TASKS_PER_CHILD,
+                                   help="recycle parsing processes after this many resumes")
+        self.__parser.add_argument('--profile', action='store_true',
+                                   help="print the per-stage timing breakdown and input sizes after the run")
         return
 
     def extract_resume_data(self):
         args = self.__parser.parse_args()
 
         if args.file and not args.directory:
-            return self.__extract_from_file(args.file)
+            results = self.__extract_from_file(args.file, args)
         elif args.directory and not args.file:
-            return self.__extract_from_directory(args.directory)
+            if args.output:
+                results = self.__stream_from_directory(args)
+            else:
+                results = self.__extract_from_directory(args)
         else:
             return 'Invalid option. Please provide a valid option.'
 
-    def __extract_from_file(self, file):
+        if args.profile:
+            print_cyan('Parse profile:')
+            print(metrics.summary())
+        return results
+
+    def __extract_from_file(self, file, args):
         if os.path.exists(file):
             print_cyan('Extracting data from: {}'.format(file))
-            resume_parser = ResumeParser(file)
-            return [resume_parser.get_extracted_data()]
+            parser = sandbox.SandboxedParser(timeout=args.timeout, memory_limit_mb=args.memory_limit,
+                                             max_tasks_per_child=args.max_tasks_per_child)
+            try:
+                result = parser.parse(file)
+            finally:
+                parser.close()
+            return [result['data'] if result['ok'] else result]
         else:
             return 'File not found. Please provide a valid file name.'
 
-    def __extract_from_directory(self, directory):
-        if os.path.exists(directory):
-            pool = mp.Pool(mp.cpu_count())
+    def __stream_from_directory(self, args):
+        # resumable ingestion: results are appended as they come in and every
+        # finished file is recorded in the manifest, which is skipped on restart
+        if not os.path.exists(args.directory):
+            return 'Directory not found. Please provide a valid directory.'
+
+        output_format = args.format or ('csv' if args.output.endswith('.csv') else 'jsonl')
+        manifest_path = args.manifest or args.output + '.manifest'
+        done = set()
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as fh:
+                done = set(line.rstrip('\n') for line in fh if line.strip())
 
-            resumes = []
-            data = []
-            for root, directories, filenames in os.walk(directory):
-                for filename in filenames:
-                    file = os.path.join(root, filename)
+        resumes = []
+        for root, directories, filenames in os.walk(args.directory):
+            for filename in filenames:
+                file = os.path.join(root, filename)
+                if file not in done:
                     resumes.append(file)
+        if done:
+            print_cyan('Resuming: {} already done, {} left'.format(len(done), len(resumes)))
 
-            results = pool.map(resume_result_wrapper, resumes)
-            pool.close()
-            pool.join()
+        write_header = output_format == 'csv' and not os.path.exists(args.output)
+        processed = errors = 0
+        start = last_report = time.time()
+        with open(args.output, 'a', encoding='utf-8', newline='') as out, \
+                open(manifest_path, 'a', encoding='utf-8') as manifest, \
+                self.__sandboxed_pool(args) as pool:
+            writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS) if output_format == 'csv' else None
+            if write_header:
+                writer.writeheader()
 
-            return results
-        else:
+            for result in pool.imap_unordered(resumes):
+                resume, error = result['resume'], result['error']
+                record = dict(result['data'] or {}, file=resume, error=error)
+                if writer is not None:
+                    writer.writerow({key: _csv_value(record.get(key)) for key in RESULT_FIELDS})
+                else:
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                # the result is flushed before the file is checkpointed, so an
+                # interrupted run may repeat a line but never loses one
+                out.flush()
+                manifest.write(resume + '\n')
+                manifest.flush()
+
+                processed += 1
+                errors += bool(error)
+                now = time.time()
+                if now - last_report >= 5 or processed == len(resumes):
+                    last_report = now
+                    sys.stderr.write('{}/{} resumes, {} errors, {:.1f} resumes/s\n'.format(
+                        processed, len(resumes), errors, processed / max(now - start, 1e-9)))
+
+        return 'Wrote {} results ({} errors) to {} in {:.1f}s'.format(processed, errors, args.output, time.time() - start)
+
+    def __extract_from_directory(self, args):
+        if not os.path.exists(args.directory):
             return 'Directory not found. Please provide a valid directory.'
 
-def resume_result_wrapper(resume):
-    print_cyan('Extracting data from: {}'.format(resume))
-    parser = ResumeParser(resume)
-    return parser.get_extracted_data()
+        resumes = []
+        for root, directories, filenames in os.walk(args.directory):
+            for filename in filenames:
+                resumes.append(os.path.join(root, filename))
+
+        results = []
+        with self.__sandboxed_pool(args) as pool:
+            for result in pool.imap_unordered(resumes):
+                print_cyan('Extracted data from: {}'.format(result['resume']))
+                results.append(result['data'] if result['ok'] else result)
+        return results
+
+    def __sandboxed_pool(self, args):
+        # one supervised child per worker: a file that crashes or hangs its
+        # child is reported as failed instead of stalling the run
+        return sandbox.SandboxedPool(args.workers, timeout=args.timeout, memory_limit_mb=args.memory_limit,
+                                     max_tasks_per_child=args.max_tasks_per_child)
+
+def _csv_value(value):
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(v) for v in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
 
 if __name__ == '__main__':
     cli_obj = ResumeParserCli()
@@ -48,6 +48,10 @@ else:
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
-# Start Gunicorn
+# Precompile the skills gazetteer so workers don't parse skills.csv
+echo "Building skills index..."
+python -m resume_parser.skills_index
+
+# Start Gunicorn with the production profile (workers, threads, preloading)
 echo "Starting Gunicorn..."
-gunicorn resume_parser.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
+gunicorn -c gunicorn.conf.py resume_parser.wsgi:application
\ No newline at end of file
@@ -0,0 +1,53 @@
+'''
+Production gunicorn profile, configured from the environment:
+
+    GUNICORN_BIND          address to listen on (default 0.0.0.0:8000)
+    GUNICORN_WORKERS       worker processes (default: number of CPUs)
+    GUNICORN_THREADS       threads per worker, > 1 switches to gthread workers (default 2)
+    GUNICORN_TIMEOUT       seconds before a silent worker is killed (default 120)
+    GUNICORN_MAX_REQUESTS  recycle a worker after this many requests, 0 to never (default 1000)
+    GUNICORN_PRELOAD       '1' to load the Django app in the master (default '1')
+    GUNICORN_PRELOAD_NLP   '1' to also load the spaCy models, skills index and NLTK data
+                           in the master (default '0')
+
+Web workers only enqueue parse jobs, `parse_worker` does the parsing and loads
+the NLP resources itself, so by default the master only preloads the app.
+'''
+
+import multiprocessing
+import os
+import time
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = max_requests // 10
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+preload_nlp = preload_app and os.environ.get('GUNICORN_PRELOAD_NLP', '0') == '1'
+
+# the config is read before the app is preloaded, so this times the whole cold start
+_started = time.perf_counter()
+
+
+def when_ready(server):
+    # runs in the master before any worker is forked
+    if preload_nlp:
+        from resume_parser.preload import preload_resources
+        seconds = preload_resources()
+        server.log.info('Preloaded NLP resources in %.2fs', seconds)
+    server.log.info('Ready to fork workers %.2fs after start', time.perf_counter() - _started)
+
+
+def post_fork(server, worker):
+    # the master may have opened database connections while preloading,
+    # a socket must not be shared between processes
+    if preload_app:
+        from django.db import connections
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    worker.log.info('Worker %s booted %.2fs after start', worker.pid, time.perf_counter() - _started)
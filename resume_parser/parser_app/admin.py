@@ -1,6 +1,24 @@
 from django.contrib import admin
-from .models import Resume
+from .models import Resume, ParseJob, ParseCache, ParseArtifact
 
 @admin.register(Resume)
 class ResumeAdmin(admin.ModelAdmin):
-    pass
\ No newline at end of file
+    pass
+
+
+@admin.register(ParseJob)
+class ParseJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'resume', 'status', 'attempts', 'created_on', 'finished_on')
+    list_filter = ('status',)
+
+
+@admin.register(ParseCache)
+class ParseCacheAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'parser_version', 'hits', 'created_on')
+    list_filter = ('parser_version',)
+
+
+@admin.register(ParseArtifact)
+class ParseArtifactAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'model', 'created_on')
+    exclude = ('doc',)
@@ -1,5 +1,5 @@
 from django.contrib.contenttypes.models import ContentType
-from rest_framework import viewsets, permissions, status, filters
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from .models import CustomUser, Resume, JobPosting, Application
 from .serializers import CandidateSerializer, ResumeSerializer, JobPostingSerializer, ApplicationSerializer, RecruiterSerializer
@@ -12,6 +12,8 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
 from django.db import transaction
 from .permissions import IsAdmin, IsRecruiter, IsCandidate, IsAdminOrRecruiter
+from .search import (CANDIDATE_SEARCH_FIELDS, JOB_POSTING_SEARCH_FIELDS, RECRUITER_SEARCH_FIELDS,
+                     is_fuzzy, search_columns, search_resumes)
 
 
 class CustomPagination(PageNumberPagination):
@@ -31,27 +33,35 @@ class CustomPagination(PageNumberPagination):
         })
 
 
-class AdminCandidateViewSet(viewsets.ModelViewSet):
+class IndexedSearchMixin(object):
+    '''
+    `?search=` over `search_fields`, typo-tolerant with `?fuzzy=1`, through the
+    indexes of `parser_app.search`. Applied by `get_queryset` rather than a
+    SearchFilter backend, which would add its own icontains scan on top.
+    '''
+    filter_backends = [DjangoFilterBackend]
+    search_fields = []
+
+    def search(self, queryset):
+        search_term = self.request.query_params.get('search', None)
+        if search_term:
+            queryset = search_columns(queryset, self.search_fields, search_term,
+                                      fuzzy=is_fuzzy(self.request.query_params))
+        return queryset
+
+
+class AdminCandidateViewSet(IndexedSearchMixin, viewsets.ModelViewSet):
     queryset = CustomUser.objects.filter(role=CustomUser.CANDIDATE)
     serializer_class = CandidateSerializer
     permission_classes = [IsAdmin]
     pagination_class = CustomPagination
-    search_fields = ['name', 'email']
+    search_fields = CANDIDATE_SEARCH_FIELDS
 
     def perform_create(self, serializer):
         serializer.save(role=CustomUser.CANDIDATE)
 
     def get_queryset(self):
-        queryset = CustomUser.objects.filter(role=CustomUser.CANDIDATE)
-        search_term = self.request.query_params.get('search', None)
-
-        if search_term:
-            queryset = queryset.filter(
-                Q(name__icontains=search_term) |
-                Q(email__icontains=search_term)
-            )
-
-        return queryset.distinct()
+        return self.search(CustomUser.objects.filter(role=CustomUser.CANDIDATE))
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -63,29 +73,18 @@ class AdminCandidateViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class AdminRecruiterViewSet(viewsets.ModelViewSet):
+class AdminRecruiterViewSet(IndexedSearchMixin, viewsets.ModelViewSet):
     queryset = CustomUser.objects.filter(role=CustomUser.RECRUITER)
     serializer_class = RecruiterSerializer
     permission_classes = [IsAdmin]
     pagination_class = CustomPagination
-    search_fields = ['name', 'email', 'company', 'position']
+    search_fields = RECRUITER_SEARCH_FIELDS
 
     def perform_create(self, serializer):
         serializer.save(role=CustomUser.RECRUITER)
 
     def get_queryset(self):
-        queryset = CustomUser.objects.filter(role=CustomUser.RECRUITER)
-        search_term = self.request.query_params.get('search', None)
-
-        if search_term:
-            queryset = queryset.filter(
-                Q(name__icontains=search_term) |
-                Q(email__icontains=search_term) |
-                Q(company__icontains=search_term) |
-                Q(position__icontains=search_term)
-            )
-
-        return queryset.distinct()
+        return self.search(CustomUser.objects.filter(role=CustomUser.RECRUITER))
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -107,27 +106,20 @@ EDUCATION_LEVELS = {
 }
 
 
-class AdminResumeViewSet(viewsets.ModelViewSet):
+class AdminResumeViewSet(IndexedSearchMixin, viewsets.ModelViewSet):
     queryset = Resume.objects.all()
     serializer_class = ResumeSerializer
     pagination_class = CustomPagination
     permission_classes = [IsAdmin]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    search_fields = ['name', 'email', 'skills', 'education', 'experience']
 
-    def get_queryset(self):
-        queryset = Resume.objects.all()
+    def search(self, queryset):
+        # full-text search over the trigger-maintained vector, see `search_resumes`
         search_term = self.request.query_params.get('search', None)
-        education_filter = self.request.query_params.get('education', None)
+        return search_resumes(queryset, search_term) if search_term else queryset
 
-        if search_term:
-            queryset = queryset.filter(
-                Q(name__icontains=search_term) |
-                Q(email__icontains=search_term) |
-                Q(skills__icontains=search_term) |
-                Q(education__icontains=search_term) |
-                Q(experience__icontains=search_term)
-            )
+    def get_queryset(self):
+        queryset = self.search(Resume.objects.all())
+        education_filter = self.request.query_params.get('education', None)
 
         if education_filter and education_filter.lower() != 'all':
             education_terms = EDUCATION_LEVELS.get(education_filter, [])
@@ -137,7 +129,7 @@ class AdminResumeViewSet(viewsets.ModelViewSet):
                     education_query |= Q(education__icontains=term)
                 queryset = queryset.filter(education_query)
 
-        return queryset.distinct()
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -154,13 +146,12 @@ class AdminResumeViewSet(viewsets.ModelViewSet):
         return Response({"detail": "Resume file not found"}, status=status.HTTP_404_NOT_FOUND)
 
 
-class AdminJobPostingViewSet(viewsets.ModelViewSet):
+class AdminJobPostingViewSet(IndexedSearchMixin, viewsets.ModelViewSet):
     queryset = JobPosting.objects.all()
     serializer_class = JobPostingSerializer
     permission_classes = [IsAdmin, IsRecruiter]
     pagination_class = CustomPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    search_fields = ['title', 'description', 'city', 'category']
+    search_fields = JOB_POSTING_SEARCH_FIELDS
 
     def perform_create(self, serializer):
         company_logo = self.request.data.get('company_logo')
@@ -196,26 +187,17 @@ class AdminJobPostingViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     def get_queryset(self):
-        queryset = JobPosting.objects.all()
-        search_term = self.request.query_params.get('search', None)
+        queryset = self.search(JobPosting.objects.all())
         location_filter = self.request.query_params.get('location', None)
         category_filter = self.request.query_params.get('category', None)
 
-        if search_term:
-            queryset = queryset.filter(
-                Q(title__icontains=search_term) |
-                Q(description__icontains=search_term) |
-                Q(city__icontains=search_term) |
-                Q(category__icontains=search_term)
-            )
-
         if location_filter and location_filter.lower() != 'all':
             queryset = queryset.filter(city__iexact=location_filter)
 
         if category_filter and category_filter.lower() != 'all':
             queryset = queryset.filter(category__iexact=category_filter)
 
-        return queryset.distinct()
+        return queryset
 
     @action(detail=True, methods=['get'])
     def applicants(self, request, pk=None):
@@ -225,34 +207,24 @@ class AdminJobPostingViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class RecruiterJobPostingViewSet(viewsets.ModelViewSet):
+class RecruiterJobPostingViewSet(IndexedSearchMixin, viewsets.ModelViewSet):
     serializer_class = JobPostingSerializer
     pagination_class = CustomPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    search_fields = ['title', 'description', 'city', 'category']
+    search_fields = JOB_POSTING_SEARCH_FIELDS
     permission_classes = [IsAdminOrRecruiter]
 
     def get_queryset(self):
-        queryset = JobPosting.objects.filter(recruiter=self.request.user)
-        search_term = self.request.query_params.get('search', None)
+        queryset = self.search(JobPosting.objects.filter(recruiter=self.request.user))
         location_filter = self.request.query_params.get('location', None)
         category_filter = self.request.query_params.get('category', None)
 
-        if search_term:
-            queryset = queryset.filter(
-                Q(title__icontains=search_term) |
-                Q(description__icontains=search_term) |
-                Q(city__icontains=search_term) |
-                Q(category__icontains=search_term)
-            )
-
         if location_filter and location_filter.lower() != 'all':
             queryset = queryset.filter(city__iexact=location_filter)
 
         if category_filter and category_filter.lower() != 'all':
             queryset = queryset.filter(category__iexact=category_filter)
 
-        return queryset.distinct()
+        return queryset
 
     def perform_create(self, serializer):
         company_logo = self.request.data.get('company_logo')
@@ -2,11 +2,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import status
-from .models import Resume
-from .serializers import ResumeSerializer
-from resume_parser.resume_parser import ResumeParser
+from rest_framework.generics import get_object_or_404
 from django.conf import settings
-import os
+from django.http import HttpResponse
+from resume_parser import metrics
+from .models import Resume, ParseJob
+from .serializers import ParseJobSerializer
+from .parsing import enqueue_resume
 from .stats import get_cv_registration_rate, get_admin_stats, get_recruiter_stats, get_candidate_stats, get_application_rate
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
@@ -23,25 +25,33 @@ class ResumeUploadView(APIView):
         if not files:
             return Response({"detail": "No files provided"}, status=status.HTTP_400_BAD_REQUEST)
 
-        resumes_data = []
+        jobs = []
         for file in files:
+            # saved by enqueue_resume, which hashes the upload in memory
             resume = Resume(resume=file)
-            resume.save()
-
-            parser = ResumeParser(os.path.join(settings.MEDIA_ROOT, resume.resume.name))
-            data = parser.get_extracted_data()
-            resumes_data.append(data)
-
-            resume.name = data.get('name')
-            resume.email = data.get('email')
-            resume.mobile_number = data.get('mobile_number')
-            resume.education = ', '.join(data.get('education')) if data.get('education') else None
-            resume.skills = ', '.join(data.get('skills')) if data.get('skills') else None
-            resume.experience = ', '.join(data.get('experience')) if data.get('experience') else None
-            resume.save()
-
-        serializer = ResumeSerializer(Resume.objects.all(), many=True)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+            jobs.append(enqueue_resume(resume, upload=file))
+
+        # parsing happens in the `parse_worker` command, poll /api/v1/parse-jobs/<id>/
+        serializer = ParseJobSerializer(jobs, many=True)
+        return Response({"jobs": serializer.data}, status=status.HTTP_202_ACCEPTED)
+
+
+class ParseJobView(APIView):
+    def get(self, request, pk):
+        jobs = ParseJob.objects.select_related('resume')
+        if not request.user.is_admin():
+            jobs = jobs.filter(resume__user=request.user)
+        job = get_object_or_404(jobs, pk=pk)
+        return Response(ParseJobSerializer(job).data)
+
+
+class MetricsView(APIView):
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        # Prometheus text format, merged across the parse worker processes
+        return HttpResponse(metrics.render(settings.PARSE_METRICS_DIR),
+                            content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 class CVRegistrationRateView(APIView):
@@ -1,4 +1,3 @@
-from django.contrib.auth import get_user_model
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -12,7 +11,7 @@ from django.http import FileResponse
 import os
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from resume_parser.resume_parser import ResumeParser
+from .parsing import enqueue_resume
 
 
 class CandidateViewSet(viewsets.ModelViewSet):
@@ -76,27 +75,13 @@ class CandidateViewSet(viewsets.ModelViewSet):
             resume = Resume(user=request.user)
 
         resume.resume = file
-        resume.save()
+        resume.name = request.user.name
 
-        User = get_user_model()
-        user = User.objects.get(pk=request.user.pk)
-        name = user.name
-
-        # Parse the resume
-        parser = ResumeParser(os.path.join(settings.MEDIA_ROOT, resume.resume.name))
-        data = parser.get_extracted_data()
-
-        # Update resume fields
-        resume.name = name
-        resume.email = data.get('email')
-        resume.mobile_number = data.get('mobile_number')
-        resume.education = ', '.join(data.get('education')) if data.get('education') else None
-        resume.skills = ', '.join(data.get('skills')) if data.get('skills') else None
-        resume.experience = ', '.join(data.get('experience')) if data.get('experience') else None
-        resume.save()
+        # Save and parse the resume in the background, the client polls /api/v1/parse-jobs/<id>/
+        job = enqueue_resume(resume, upload=file)
 
         serializer = self.get_serializer(resume)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response({"job_id": job.pk, "resume": serializer.data}, status=status.HTTP_202_ACCEPTED)
 
     @action(detail=False, methods=['get'])
     def download(self, request):
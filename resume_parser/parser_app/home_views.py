@@ -9,6 +9,7 @@ from .models import JobPosting, Blog
 from .serializers import JobPostingSerializer, BlogSerializer
 from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from .permissions import IsAdmin
+from .search import JOB_POSTING_KEYWORD_FIELDS, is_fuzzy, search_columns
 
 
 class JobPostingsView(APIView):
@@ -32,7 +33,8 @@ class JobPostingsView(APIView):
             category = request.query_params.get('category')
 
             if keywords:
-                queryset = queryset.filter(title__icontains=keywords) | queryset.filter(description__icontains=keywords)
+                queryset = search_columns(queryset, JOB_POSTING_KEYWORD_FIELDS, keywords,
+                                          fuzzy=is_fuzzy(request.query_params))
             if location:
                 queryset = queryset.filter(city__iexact=location)
             if category:
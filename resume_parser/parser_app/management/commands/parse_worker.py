@@ -0,0 +1,63 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from resume_parser.preload import preload_resources
+from parser_app.parsing import claim_next_job, run_job, requeue_stale_jobs, get_sandbox
+from parser_app import parse_cache
+
+
+class Command(BaseCommand):
+    help = 'Consume the resume parse-job queue. Run as many workers as needed, on any number of nodes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help='seconds to wait when the queue is empty')
+        parser.add_argument('--max-jobs', type=int, default=0,
+                            help='exit after processing this many jobs (0 = run forever)')
+        parser.add_argument('--once', action='store_true',
+                            help='drain the queue and exit instead of polling')
+        parser.add_argument('--stale-after', type=int, default=600,
+                            help='requeue jobs left RUNNING for more than this many seconds (0 = never)')
+
+    def handle(self, *args, **options):
+        # every language, so recycled sandbox children inherit the models instead of reloading them
+        self.stdout.write('Preloaded NLP resources in {:.2f}s'.format(preload_resources()))
+        evicted = parse_cache.prune()
+        if evicted:
+            self.stdout.write('Evicted {} parse cache entries'.format(evicted))
+        self.stdout.write('Parse worker started')
+
+        try:
+            self.__consume(options)
+        finally:
+            get_sandbox().close()
+
+    def __consume(self, options):
+        processed = 0
+        while not options['max_jobs'] or processed < options['max_jobs']:
+            close_old_connections()
+            if options['stale_after']:
+                requeued, failed = requeue_stale_jobs(timedelta(seconds=options['stale_after']))
+                if requeued:
+                    self.stdout.write('Requeued {} stale job(s)'.format(requeued))
+                if failed:
+                    self.stdout.write(self.style.ERROR('Gave up on {} stale job(s) after {} attempts'.format(
+                        failed, settings.PARSE_MAX_ATTEMPTS)))
+
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            if run_job(job):
+                self.stdout.write(self.style.SUCCESS('Parsed job {} (resume {})'.format(job.pk, job.resume_id)))
+            else:
+                self.stdout.write(self.style.ERROR('Job {} failed: {}'.format(job.pk, job.error)))
+            processed += 1
+
+        self.stdout.write('Parse worker stopped after {} job(s)'.format(processed))
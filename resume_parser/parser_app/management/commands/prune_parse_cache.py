@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from parser_app.parse_cache import prune
+
+
+class Command(BaseCommand):
+    help = 'Evict stale entries from the parse result cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age-days', type=int, default=None,
+                            help='drop entries older than this (default: settings.PARSE_CACHE_MAX_AGE_DAYS)')
+        parser.add_argument('--max-entries', type=int, default=None,
+                            help='keep at most this many entries (default: settings.PARSE_CACHE_MAX_ENTRIES)')
+
+    def handle(self, *args, **options):
+        deleted = prune(options['max_age_days'], options['max_entries'])
+        self.stdout.write(self.style.SUCCESS('Evicted {} cache entries'.format(deleted)))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from resume_parser import nlp_registry
+from parser_app.models import Resume
+from parser_app.parsing import reextract_resume, enqueue_resume
+from parser_app import parse_cache
+
+
+class Command(BaseCommand):
+    help = ('Refresh the extracted fields of every resume from its stored text and Doc, '
+            'running only the rule-based extractors.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--enqueue-missing', action='store_true',
+                            help='queue a full parse for resumes without stored artifacts')
+
+    def handle(self, *args, **options):
+        nlp_registry.warm_up()
+        refreshed = missing = 0
+        resumes = Resume.objects.exclude(resume='').exclude(resume__isnull=True).select_related('user')
+        for resume in resumes.iterator():
+            try:
+                sha256 = parse_cache.file_sha256(resume.resume.path)
+            except OSError as e:
+                self.stderr.write('Resume {}: {}'.format(resume.pk, e))
+                continue
+            # duplicates of a file already re-extracted are served by the parse cache
+            if reextract_resume(resume, sha256) is not None:
+                refreshed += 1
+                continue
+            missing += 1
+            if options['enqueue_missing']:
+                enqueue_resume(resume)
+
+        self.stdout.write(self.style.SUCCESS('Re-extracted {} resumes'.format(refreshed)))
+        if missing:
+            action = 'queued for a full parse' if options['enqueue_missing'] else 'skipped'
+            self.stdout.write('{} resumes had no stored artifacts and were {}'.format(missing, action))
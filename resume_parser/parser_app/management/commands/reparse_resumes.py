@@ -0,0 +1,173 @@
+import multiprocessing as mp
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DataError, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from resume_parser import metrics
+from resume_parser.preload import preload_resources
+from resume_parser import sandbox
+from resume_parser.version import PARSER_VERSION
+from parser_app.models import ParseJob, Resume
+from parser_app.parsing import RESUME_FIELDS, assign_parsed_data, reextract, stale_resumes
+from parser_app import parse_artifacts
+from parser_app import parse_cache
+
+# columns written back in one `bulk_update` per batch
+UPDATED_COLUMNS = list(RESUME_FIELDS) + ['parser_version']
+
+
+def _snapshot(resume, last_job_id):
+    '''
+    What a re-upload during the run changes: the file, the parser version once the
+    new file is parsed, and a new parse job (the file name can be reused)
+    '''
+    return (resume.resume.name, resume.parser_version, last_job_id)
+
+
+def _parse_date(value):
+    try:
+        return timezone.make_aware(datetime.strptime(value, '%Y-%m-%d'))
+    except ValueError:
+        raise CommandError('--since expects a date as YYYY-MM-DD, got {!r}'.format(value))
+
+
+class Command(BaseCommand):
+    help = ('Re-parse resumes whose fields were produced by an older parser version. '
+            'Rows are stamped batch by batch, so an interrupted run picks up where it stopped.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=_parse_date, default=None,
+                            help='only resumes uploaded on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--only-missing-skills', action='store_true',
+                            help='only resumes without extracted skills')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='rows read and written back per batch')
+        parser.add_argument('--workers', type=int, default=mp.cpu_count(),
+                            help='parser processes for files that need a full parse')
+        parser.add_argument('--limit', type=int, default=0,
+                            help='stop after this many resumes (0 = all)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='only count the stale resumes')
+
+    def handle(self, *args, **options):
+        resumes = stale_resumes(options['since'], options['only_missing_skills'])
+        total = resumes.count()
+        self.stdout.write('{} resumes are not at parser version {}'.format(total, PARSER_VERSION))
+        if options['dry_run'] or not total:
+            return
+
+        # load the models before forking so the parser processes share them,
+        # and don't let the children inherit the open database connections
+        preload_resources()
+        connections.close_all()
+        pool = sandbox.SandboxedPool(options['workers'], timeout=settings.PARSE_TIMEOUT_SECONDS,
+                                     memory_limit_mb=settings.PARSE_MEMORY_LIMIT_MB,
+                                     max_tasks_per_child=settings.PARSE_MAX_TASKS_PER_CHILD)
+        pool.start()
+        counts = {'reextracted': 0, 'parsed': 0, 'written': 0, 'changed': 0, 'failed': 0}
+        try:
+            self.__run(resumes, pool, options, counts)
+        finally:
+            pool.close()
+            if settings.PARSE_METRICS_DIR:
+                metrics.REGISTRY.dump(settings.PARSE_METRICS_DIR)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Re-extracted {reextracted}, parsed {parsed}, wrote {written}, skipped {changed} changed '
+            'during the run, failed {failed}'.format(**counts)))
+
+    def __run(self, resumes, pool, options, counts):
+        last_pk = 0
+        done = 0
+        while not options['limit'] or done < options['limit']:
+            size = options['batch_size']
+            if options['limit']:
+                size = min(size, options['limit'] - done)
+            # keyset pagination: rows that failed stay stale but are not retried in this run
+            batch = list(resumes.filter(pk__gt=last_pk).annotate(last_job_id=Max('parse_jobs__id'))[:size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            done += len(batch)
+
+            read = {resume.pk: _snapshot(resume, resume.last_job_id) for resume in batch}
+            updated = self.__reparse_batch(batch, pool, counts)
+            written = self.__write(updated, read, counts)
+            self.stdout.write('Up to resume {}: {} updated'.format(last_pk, written))
+
+    def __write(self, updated, read, counts):
+        '''
+        Write back the re-parsed resumes that did not change since `read`, in one
+        `bulk_update` or, when a value is refused, row by row
+
+        :return: number of rows written
+        '''
+        with transaction.atomic():
+            unchanged = self.__unchanged(updated, read)
+            counts['changed'] += len(updated) - len(unchanged)
+            try:
+                with transaction.atomic():
+                    Resume.objects.bulk_update(unchanged, UPDATED_COLUMNS)
+                written = len(unchanged)
+            except DataError:
+                written = 0
+                for resume in unchanged:
+                    try:
+                        with transaction.atomic():
+                            resume.save(update_fields=UPDATED_COLUMNS)
+                        written += 1
+                    except DataError as e:
+                        counts['failed'] += 1
+                        self.stderr.write('Resume {}: {}'.format(resume.pk, e))
+        counts['written'] += written
+        return written
+
+    def __unchanged(self, updated, read):
+        '''
+        Lock the rows of `updated` and keep those still as `read`, so the fields of
+        a file replaced during the run are not written over the new upload
+        '''
+        pks = [resume.pk for resume in updated]
+        rows = Resume.objects.select_for_update().filter(pk__in=pks).values_list('pk', 'resume', 'parser_version')
+        last_jobs = dict(ParseJob.objects.filter(resume__in=pks).order_by()
+                         .values('resume').annotate(last=Max('pk')).values_list('resume', 'last'))
+        current = {pk: (name, version, last_jobs.get(pk)) for pk, name, version in rows}
+        return [resume for resume in updated if current.get(resume.pk) == read[resume.pk]]
+
+    def __reparse_batch(self, batch, pool, counts):
+        '''
+        :return: the resumes of `batch` whose fields were refreshed
+        '''
+        updated = []
+        by_path = {}
+        for resume in batch:
+            path = resume.resume.path
+            try:
+                sha256 = parse_cache.file_sha256(path)
+            except OSError as e:
+                counts['failed'] += 1
+                self.stderr.write('Resume {}: {}'.format(resume.pk, e))
+                continue
+            data = reextract(path, sha256)
+            if data is not None:
+                counts['reextracted'] += 1
+                updated.append(assign_parsed_data(resume, data))
+            else:
+                by_path.setdefault(path, []).append((resume, sha256))
+
+        for result in pool.imap_unordered(list(by_path), fields=RESUME_FIELDS, keep_artifacts=True):
+            rows = by_path[result['resume']]
+            if not result['ok']:
+                counts['failed'] += len(rows)
+                self.stderr.write('{}: {}'.format(result['resume'], result['error']))
+                continue
+            sha256 = rows[0][1]
+            parse_cache.store(sha256, result['data'])
+            parse_artifacts.store(sha256, result['artifacts'])
+            for resume, sha256 in rows:
+                counts['parsed'] += 1
+                updated.append(assign_parsed_data(resume, result['data']))
+        return updated
@@ -0,0 +1,30 @@
+# Generated by Django 2.2.10 on 2026-10-17 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parser_app', '0007_auto_20240711_1244'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParseJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PE', 'Pending'), ('RU', 'Running'), ('DO', 'Done'), ('FA', 'Failed')], db_index=True, default='PE', max_length=2)),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Attempts')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Error')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Created On')),
+                ('started_on', models.DateTimeField(blank=True, null=True, verbose_name='Started On')),
+                ('finished_on', models.DateTimeField(blank=True, null=True, verbose_name='Finished On')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parse_jobs', to='parser_app.Resume')),
+            ],
+            options={
+                'ordering': ['created_on'],
+            },
+        ),
+    ]
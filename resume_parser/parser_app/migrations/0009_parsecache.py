@@ -0,0 +1,27 @@
+# Generated by Django 2.2.10 on 2026-10-17 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parser_app', '0008_parsejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParseCache',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, verbose_name='SHA-256')),
+                ('parser_version', models.CharField(max_length=32, verbose_name='Parser Version')),
+                ('data', models.TextField(verbose_name='Extracted Data')),
+                ('created_on', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created On')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='Hits')),
+            ],
+            options={
+                'unique_together': {('sha256', 'parser_version')},
+            },
+        ),
+    ]
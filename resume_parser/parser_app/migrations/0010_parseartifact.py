@@ -0,0 +1,24 @@
+# Generated by Django 2.2.10 on 2026-10-17 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parser_app', '0009_parsecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParseArtifact',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='SHA-256')),
+                ('model', models.CharField(max_length=64, verbose_name='spaCy Model')),
+                ('text', models.TextField(verbose_name='Raw Text')),
+                ('doc', models.BinaryField(verbose_name='Serialized Doc')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Created On')),
+            ],
+        ),
+    ]
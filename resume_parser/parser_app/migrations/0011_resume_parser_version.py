@@ -0,0 +1,18 @@
+# Generated by Django 2.2.10 on 2026-10-17 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parser_app', '0010_parseartifact'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='parser_version',
+            field=models.CharField(blank=True, db_index=True, max_length=32, null=True, verbose_name='Parser Version'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.10 on 2026-10-17 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parser_app', '0011_resume_parser_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parsejob',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64, null=True, verbose_name='SHA-256'),
+        ),
+    ]
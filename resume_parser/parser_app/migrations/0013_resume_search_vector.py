@@ -0,0 +1,64 @@
+# Generated by Django 2.2.10 on 2026-10-17 17:55
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Names and e-mails are matched as written ('simple'), skills both as written and stemmed,
+# education and experience stemmed ('french'). E-mails are also split on '@' and '.' so
+# a domain or the local part alone finds them.
+CREATE_TRIGGER = '''
+CREATE FUNCTION parser_app_resume_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.email, '')), 'A') ||
+        setweight(to_tsvector('simple', translate(coalesce(NEW.email, ''), '@.', '  ')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.skills, '')), 'B') ||
+        setweight(to_tsvector('french', coalesce(NEW.skills, '')), 'B') ||
+        setweight(to_tsvector('french', coalesce(NEW.education, '')), 'C') ||
+        setweight(to_tsvector('french', coalesce(NEW.experience, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(NEW.education, '') || ' ' || coalesce(NEW.experience, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER parser_app_resume_search_vector
+    BEFORE INSERT OR UPDATE OF name, email, skills, education, experience ON parser_app_resume
+    FOR EACH ROW EXECUTE PROCEDURE parser_app_resume_search_vector_update();
+
+UPDATE parser_app_resume SET name = name;
+
+CREATE INDEX parser_app_resume_search_vector_gin ON parser_app_resume USING gin (search_vector);
+'''
+
+DROP_TRIGGER = '''
+DROP INDEX IF EXISTS parser_app_resume_search_vector_gin;
+DROP TRIGGER IF EXISTS parser_app_resume_search_vector ON parser_app_resume;
+DROP FUNCTION IF EXISTS parser_app_resume_search_vector_update();
+'''
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parser_app', '0012_parsejob_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
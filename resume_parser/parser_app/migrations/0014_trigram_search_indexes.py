@@ -0,0 +1,44 @@
+# Generated by Django 2.2.10 on 2026-10-17 18:30
+
+from django.db import migrations
+
+# Expression indexes on UPPER(column::text): the expression Django's `icontains` compiles
+# to on Postgres, and the one the fuzzy search of `parser_app.search` compares.
+TRIGRAM_INDEXES = {
+    'parser_app_customuser': ['name', 'email', 'company', 'position'],
+    'parser_app_jobposting': ['title', 'description', 'city', 'category'],
+}
+
+
+def index_name(table, column):
+    return '{}_{}_trgm'.format(table, column)
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    quote = schema_editor.quote_name
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, columns in TRIGRAM_INDEXES.items():
+        for column in columns:
+            schema_editor.execute('CREATE INDEX {} ON {} USING gin (UPPER({}::text) gin_trgm_ops)'.format(
+                quote(index_name(table, column)), quote(table), quote(column)))
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, columns in TRIGRAM_INDEXES.items():
+        for column in columns:
+            schema_editor.execute('DROP INDEX IF EXISTS {}'.format(schema_editor.quote_name(index_name(table, column))))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parser_app', '0013_resume_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
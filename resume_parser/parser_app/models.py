@@ -3,6 +3,7 @@ from django import forms
 from django.forms import ClearableFileInput
 
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
@@ -80,11 +81,67 @@ class Resume(models.Model):
     skills = models.CharField('Skills', max_length=1000, null=True, blank=True)
     experience = models.CharField('Experience', max_length=1000, null=True, blank=True)
     uploaded_on = models.DateTimeField('Uploaded On', auto_now_add=True)
+    parser_version = models.CharField('Parser Version', max_length=32, null=True, blank=True, db_index=True)
+    # kept up to date by a database trigger on Postgres (see migration 0013), unused elsewhere
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return f"{self.user.name}'s Resume" if self.user else "Unassigned Resume"
 
 
+class ParseJob(models.Model):
+    PENDING = 'PE'
+    RUNNING = 'RU'
+    DONE = 'DO'
+    FAILED = 'FA'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='parse_jobs')
+    sha256 = models.CharField('SHA-256', max_length=64, null=True, blank=True)
+    status = models.CharField(max_length=2, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    attempts = models.PositiveIntegerField('Attempts', default=0)
+    error = models.TextField('Error', null=True, blank=True)
+    created_on = models.DateTimeField('Created On', auto_now_add=True)
+    started_on = models.DateTimeField('Started On', null=True, blank=True)
+    finished_on = models.DateTimeField('Finished On', null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_on']
+
+    def __str__(self):
+        return f"Parse job {self.pk} ({self.get_status_display()})"
+
+
+class ParseCache(models.Model):
+    sha256 = models.CharField('SHA-256', max_length=64)
+    parser_version = models.CharField('Parser Version', max_length=32)
+    data = models.TextField('Extracted Data')
+    created_on = models.DateTimeField('Created On', auto_now_add=True, db_index=True)
+    hits = models.PositiveIntegerField('Hits', default=0)
+
+    class Meta:
+        unique_together = ('sha256', 'parser_version')
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.parser_version})"
+
+
+class ParseArtifact(models.Model):
+    sha256 = models.CharField('SHA-256', max_length=64, unique=True)
+    model = models.CharField('spaCy Model', max_length=64)
+    text = models.TextField('Raw Text')
+    doc = models.BinaryField('Serialized Doc')
+    created_on = models.DateTimeField('Created On', auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.model})"
+
+
 class UploadResumeModelForm(forms.ModelForm):
     class Meta:
         model = Resume
@@ -0,0 +1,49 @@
+from django.db import IntegrityError, transaction
+from .models import ParseArtifact
+
+
+def get(sha256):
+    '''
+    Return the stored text and Doc of a file hash, ignoring artifacts
+    produced by another version of their spaCy model
+
+    :return: `ParseArtifact` or None
+    '''
+    from resume_parser import nlp_registry
+    artifact = ParseArtifact.objects.filter(sha256=sha256).first()
+    if artifact is None or artifact.model != nlp_registry.model_version(model_name(artifact)):
+        return None
+    return artifact
+
+
+def model_name(artifact):
+    '''
+    :return: name of the spaCy model that built the artifact's Doc, e.g. 'en_core_web_sm'
+    '''
+    return artifact.model.rsplit('-', 1)[0]
+
+
+def store(sha256, artifacts):
+    '''
+    Save (or replace) the artifacts returned by `guarded_parse(..., keep_artifacts=True)`
+    '''
+    if not artifacts:
+        return
+    try:
+        with transaction.atomic():
+            ParseArtifact.objects.update_or_create(sha256=sha256, defaults={
+                'model': artifacts['model'],
+                'text': artifacts['text_raw'],
+                'doc': artifacts['doc'],
+            })
+    except IntegrityError:
+        # another worker stored the same file first
+        pass
+
+
+def load_doc(artifact):
+    '''
+    :return: object of `spacy.tokens.doc.Doc` rebuilt from `artifact`
+    '''
+    from resume_parser import nlp_registry
+    return nlp_registry.doc_from_bytes(bytes(artifact.doc), model=model_name(artifact))
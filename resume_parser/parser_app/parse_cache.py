@@ -0,0 +1,83 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from resume_parser.version import PARSER_VERSION
+from .models import ParseCache
+
+
+def file_sha256(file, chunk_size=64 * 1024):
+    '''
+    SHA-256 of a file's bytes, read in chunks
+
+    :param file: path, bytes or Django `File` / file-like object opened in binary mode
+    :return: hex digest
+    '''
+    if isinstance(file, bytes):
+        return hashlib.sha256(file).hexdigest()
+    digest = hashlib.sha256()
+    if isinstance(file, str):
+        with open(file, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(chunk_size), b''):
+                digest.update(chunk)
+    else:
+        file.seek(0)
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+        file.seek(0)
+    return digest.hexdigest()
+
+
+def get_cached(sha256, parser_version=PARSER_VERSION):
+    '''
+    Return the cached extraction for a file hash produced by `parser_version`
+
+    :return: dictionary of extracted data or None on a miss
+    '''
+    entry = ParseCache.objects.filter(sha256=sha256, parser_version=parser_version).first()
+    if entry is None:
+        return None
+    ParseCache.objects.filter(pk=entry.pk).update(hits=F('hits') + 1)
+    return json.loads(entry.data)
+
+
+def store(sha256, data, parser_version=PARSER_VERSION):
+    '''
+    Save the extraction for a file hash. Concurrent workers may race on the
+    same file, the first write wins.
+    '''
+    try:
+        with transaction.atomic():
+            ParseCache.objects.create(sha256=sha256, parser_version=parser_version, data=json.dumps(data))
+    except IntegrityError:
+        pass
+
+
+def prune(max_age_days=None, max_entries=None):
+    '''
+    Evict entries from older parser versions, entries older than
+    `max_age_days` and, beyond `max_entries`, the oldest remaining ones
+
+    :return: number of deleted entries
+    '''
+    if max_age_days is None:
+        max_age_days = settings.PARSE_CACHE_MAX_AGE_DAYS
+    if max_entries is None:
+        max_entries = settings.PARSE_CACHE_MAX_ENTRIES
+
+    deleted, _ = ParseCache.objects.exclude(parser_version=PARSER_VERSION).delete()
+
+    cutoff = timezone.now() - timedelta(days=max_age_days)
+    count, _ = ParseCache.objects.filter(created_on__lt=cutoff).delete()
+    deleted += count
+
+    overflow = ParseCache.objects.count() - max_entries
+    if overflow > 0:
+        oldest = ParseCache.objects.order_by('created_on').values_list('pk', flat=True)[:overflow]
+        count, _ = ParseCache.objects.filter(pk__in=list(oldest)).delete()
+        deleted += count
+    return deleted
@@ -0,0 +1,257 @@
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from resume_parser import metrics
+from resume_parser.version import PARSER_VERSION
+from .models import Resume, ParseJob
+from . import parse_artifacts
+from . import parse_cache
+
+# The parsing stack (spaCy, NLTK, pdfminer) is imported by the functions that
+# parse, so views that only enqueue and `manage.py` commands never load it.
+
+# fields stored on `Resume`, competencies and measurable results are not persisted
+RESUME_FIELDS = ('name', 'email', 'mobile_number', 'skills', 'education', 'experience')
+
+_sandbox = None
+
+
+def get_sandbox():
+    '''
+    Process-wide supervised parser configured from the PARSE_* settings
+    '''
+    global _sandbox
+    if _sandbox is None:
+        from resume_parser.sandbox import SandboxedParser
+        _sandbox = SandboxedParser(timeout=settings.PARSE_TIMEOUT_SECONDS,
+                                   memory_limit_mb=settings.PARSE_MEMORY_LIMIT_MB,
+                                   max_tasks_per_child=settings.PARSE_MAX_TASKS_PER_CHILD)
+    return _sandbox
+
+
+def enqueue_resume(resume, upload=None):
+    '''
+    Save a `Resume` and queue it for parsing by the `parse_worker` command.
+    Files already in the parse cache get their fields in that same save and
+    the job is created as DONE.
+
+    :param resume: `Resume` instance with a file, saved or not
+    :param upload: the `UploadedFile` assigned to `resume.resume`, hashed in
+                   memory instead of reading the stored file back
+    :return: the created `ParseJob`
+    '''
+    if upload is None:
+        if resume.pk is None:
+            resume.save()
+        sha256 = parse_cache.file_sha256(resume.resume.path)
+    else:
+        sha256 = parse_cache.file_sha256(upload)
+    data = parse_cache.get_cached(sha256)
+    if data is None:
+        resume.save()
+        return ParseJob.objects.create(resume=resume, sha256=sha256)
+
+    apply_parsed_data(resume, data)
+    now = timezone.now()
+    return ParseJob.objects.create(resume=resume, sha256=sha256, status=ParseJob.DONE,
+                                   started_on=now, finished_on=now)
+
+
+def apply_parsed_data(resume, data):
+    '''
+    Copy the fields extracted by `ResumeParser` onto a `Resume` and save it,
+    see `assign_parsed_data`
+    '''
+    assign_parsed_data(resume, data)
+    resume.save()
+    return resume
+
+
+def assign_parsed_data(resume, data):
+    '''
+    Copy the fields extracted by `ResumeParser` onto a `Resume` without saving
+    and stamp it with the current `PARSER_VERSION`. Resumes owned by a
+    candidate keep the account name instead of the parsed one.
+    '''
+    resume.name = resume.user.name if resume.user else _column_value('name', data.get('name'))
+    for field in ('email', 'mobile_number', 'education', 'skills', 'experience'):
+        setattr(resume, field, _column_value(field, data.get(field)))
+    resume.parser_version = PARSER_VERSION
+    return resume
+
+
+def _column_value(field, value):
+    '''
+    An extracted value fitted to its `Resume` column: lists are joined with ', ' and
+    cut after the last item that fits, NUL characters (refused by Postgres) are dropped
+    '''
+    if not value:
+        return None
+    max_length = Resume._meta.get_field(field).max_length
+    if isinstance(value, (list, tuple)):
+        value = ', '.join(value).replace('\x00', '')
+        if len(value) > max_length:
+            value = value[:max_length + 2].rsplit(', ', 1)[0]
+    else:
+        value = value.replace('\x00', '')
+    return value[:max_length] or None
+
+
+def parse_resume(resume, sha256=None):
+    '''
+    Run the parser on the file of a `Resume` and store the result on it.
+    Identical files parsed by the current parser version come from the cache,
+    others are read from storage once and parsed from memory in the sandboxed
+    child process, which also hands back the raw text and Doc for `reextract_resume`.
+
+    :param resume: saved `Resume` instance with an uploaded file
+    :param sha256: hash of the file if already known (see `ParseJob.sha256`)
+    :return: dictionary of extracted data
+    :raises ParseError: on timeout, memory exhaustion or parser failure
+    '''
+    data = parse_cache.get_cached(sha256) if sha256 else None
+    if data is None:
+        with resume.resume.open('rb') as fh:
+            content = fh.read()
+        # hash what is actually parsed, the file may have been replaced since the job was queued
+        actual = parse_cache.file_sha256(content)
+        if actual != sha256:
+            sha256 = actual
+            data = parse_cache.get_cached(sha256)
+    if data is None:
+        extension = os.path.splitext(resume.resume.name)[1].lower()
+        result = get_sandbox().parse(content, fields=RESUME_FIELDS, keep_artifacts=True, extension=extension)
+        if settings.PARSE_METRICS_DIR:
+            metrics.REGISTRY.dump(settings.PARSE_METRICS_DIR)
+        if not result['ok']:
+            from resume_parser.sandbox import ParseError
+            raise ParseError(result)
+        data = result['data']
+        parse_cache.store(sha256, data)
+        parse_artifacts.store(sha256, result['artifacts'])
+    apply_parsed_data(resume, data)
+    return data
+
+
+def reextract_resume(resume, sha256=None):
+    '''
+    Re-run only the rule-based extractors of a `Resume` on its stored text
+    and Doc, skipping pdfminer and the spaCy pipeline. Use after changing
+    `constants.py` (and bumping `PARSER_VERSION`).
+
+    :param resume: saved `Resume` instance with an uploaded file
+    :param sha256: hash of the file, computed when None
+    :return: dictionary of extracted data, or None when the file has no
+             artifacts for the installed version of its spaCy model
+    '''
+    if sha256 is None:
+        sha256 = parse_cache.file_sha256(resume.resume.path)
+    data = reextract(resume.resume.path, sha256)
+    if data is not None:
+        apply_parsed_data(resume, data)
+    return data
+
+
+def reextract(path, sha256):
+    '''
+    Extracted data of a file from the parse cache, or from its stored
+    artifacts when the cache has no entry for the current parser version
+
+    :return: dictionary of extracted data or None
+    '''
+    data = parse_cache.get_cached(sha256)
+    if data is None:
+        artifact = parse_artifacts.get(sha256)
+        if artifact is None:
+            return None
+        from resume_parser.resume_parser import ResumeParser
+        parser = ResumeParser.from_doc(path, artifact.text, parse_artifacts.load_doc(artifact), fields=RESUME_FIELDS)
+        data = parser.get_extracted_data()
+        parse_cache.store(sha256, data)
+    return data
+
+
+def stale_resumes(since=None, only_missing_skills=False):
+    '''
+    Resumes with a file whose fields were not produced by the current `PARSER_VERSION`
+
+    :param since: only resumes uploaded on or after this datetime
+    :param only_missing_skills: only resumes without extracted skills
+    :return: queryset ordered by primary key
+    '''
+    resumes = (Resume.objects
+               .exclude(resume='').exclude(resume__isnull=True)
+               .filter(Q(parser_version__isnull=True) | ~Q(parser_version=PARSER_VERSION)))
+    if since is not None:
+        resumes = resumes.filter(uploaded_on__gte=since)
+    if only_missing_skills:
+        resumes = resumes.filter(Q(skills__isnull=True) | Q(skills=''))
+    return resumes.select_related('user').order_by('pk')
+
+
+def claim_next_job():
+    '''
+    Atomically claim the oldest pending job. On Postgres the row is locked
+    with `FOR UPDATE SKIP LOCKED`, so any number of workers on any number of
+    nodes can poll the same table without handing out a job twice.
+
+    :return: the claimed `ParseJob` (now RUNNING) or None if the queue is empty
+    '''
+    with transaction.atomic():
+        job = (ParseJob.objects
+               .select_for_update(skip_locked=True)
+               .filter(status=ParseJob.PENDING)
+               .order_by('created_on', 'id')
+               .first())
+        if job is None:
+            return None
+        job.status = ParseJob.RUNNING
+        job.attempts += 1
+        job.started_on = timezone.now()
+        job.save(update_fields=['status', 'attempts', 'started_on'])
+    return job
+
+
+def run_job(job):
+    '''
+    Parse the resume of a claimed job and record the outcome on the job
+
+    :param job: `ParseJob` returned by `claim_next_job`
+    :return: True if the resume was parsed, False otherwise
+    '''
+    try:
+        parse_resume(job.resume, sha256=job.sha256)
+    except Resume.DoesNotExist:
+        job.status = ParseJob.FAILED
+        job.error = 'Resume no longer exists'
+    except Exception as e:
+        job.status = ParseJob.FAILED
+        job.error = '{}: {}'.format(type(e).__name__, e)
+    else:
+        job.status = ParseJob.DONE
+        job.error = None
+    job.finished_on = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_on'])
+    return job.status == ParseJob.DONE
+
+
+def requeue_stale_jobs(older_than):
+    '''
+    Put jobs that have been RUNNING for longer than `older_than` back in the
+    queue, e.g. after a worker was killed mid-parse. Jobs already claimed
+    `PARSE_MAX_ATTEMPTS` times are marked FAILED instead, so a file that keeps
+    taking its worker down is not retried forever.
+
+    :param older_than: `datetime.timedelta`
+    :return: (number of requeued jobs, number of failed jobs)
+    '''
+    now = timezone.now()
+    stale = ParseJob.objects.filter(status=ParseJob.RUNNING, started_on__lt=now - older_than)
+    failed = (stale.filter(attempts__gte=settings.PARSE_MAX_ATTEMPTS)
+              .update(status=ParseJob.FAILED, finished_on=now,
+                      error='Worker lost during each of {} attempts'.format(settings.PARSE_MAX_ATTEMPTS)))
+    requeued = stale.update(status=ParseJob.PENDING, started_on=None)
+    return requeued, failed
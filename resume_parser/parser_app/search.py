@@ -0,0 +1,116 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import CharField, F, FloatField, Func, Lookup, Q, TextField, Value
+from django.db.models.functions import Greatest, Upper
+
+RESUME_SEARCH_FIELDS = ['name', 'email', 'skills', 'education', 'experience']
+CANDIDATE_SEARCH_FIELDS = ['name', 'email']
+RECRUITER_SEARCH_FIELDS = ['name', 'email', 'company', 'position']
+JOB_POSTING_SEARCH_FIELDS = ['title', 'description', 'city', 'category']
+JOB_POSTING_KEYWORD_FIELDS = ['title', 'description']
+
+# characters with a meaning in tsquery syntax, dropped from what the user typed
+TSQUERY_OPERATORS = re.compile(r"[&|!():*<>'\\]")
+
+
+def prefix_tsquery(term):
+    '''
+    Raw tsquery matching every word of `term` as a prefix, so results show up while
+    the last word is still being typed: ``'dévelop pyth'`` -> ``'dévelop:* & pyth:*'``
+
+    :return: tsquery string, or None when `term` has no word left
+    '''
+    words = TSQUERY_OPERATORS.sub(' ', term).split()
+    if not words:
+        return None
+    return ' & '.join(word + ':*' for word in words)
+
+
+def resume_search_query(term):
+    '''
+    Search query over the French and the simple configuration, mirroring how
+    `Resume.search_vector` is built
+    '''
+    raw = prefix_tsquery(term)
+    if raw is None:
+        return None
+    return (SearchQuery(raw, config='french', search_type='raw') |
+            SearchQuery(raw, config='simple', search_type='raw'))
+
+
+def search_resumes(queryset, term):
+    '''
+    Filter `queryset` on `term`. On Postgres the trigger-maintained `search_vector` is
+    matched through its GIN index and results are ranked best first; other backends
+    fall back to `icontains` on each searched column.
+    '''
+    if connection.vendor != 'postgresql':
+        return search_columns(queryset, RESUME_SEARCH_FIELDS, term)
+
+    query = resume_search_query(term)
+    if query is None:
+        return queryset.none()
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F('search_vector'), query)
+    ).order_by('-search_rank', '-uploaded_on')
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class TrigramWordSimilar(Lookup):
+    '''
+    ``column %> term``: some extent of the column is similar to `term`, per
+    `pg_trgm.word_similarity_threshold`. Served by a gin_trgm_ops index on the column.
+    '''
+    lookup_name = 'trigram_word_similar'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return '%s %%%%> %s' % (lhs, rhs), lhs_params + rhs_params
+
+
+class WordSimilarity(Func):
+    function = 'word_similarity'
+    output_field = FloatField()
+
+
+def is_fuzzy(query_params):
+    '''
+    Whether the request asked for typo-tolerant search with ``?fuzzy=1``
+    '''
+    return query_params.get('fuzzy', '').lower() in ('1', 'true', 'yes')
+
+
+def search_columns(queryset, fields, term, fuzzy=False):
+    '''
+    Filter `queryset` to rows where one of `fields` contains `term`, ignoring case.
+
+    On Postgres each field has a trigram index on ``UPPER(field)`` (migration 0014),
+    the expression `icontains` compiles to, so the ORed filters become a bitmap OR of
+    index scans. With `fuzzy` the rows are instead matched by trigram word similarity,
+    which tolerates typos, and ordered most similar first; other backends ignore `fuzzy`.
+    '''
+    if fuzzy and connection.vendor == 'postgresql':
+        return fuzzy_search_columns(queryset, fields, term)
+    query = Q()
+    for field in fields:
+        query |= Q(**{field + '__icontains': term})
+    return queryset.filter(query)
+
+
+def fuzzy_search_columns(queryset, fields, term):
+    # compare upper-cased values so the same expression indexes serve both modes;
+    # trigrams are case-insensitive anyway
+    term = term.upper()
+    upper = {field + '_upper': Upper(field) for field in fields}
+    query = Q()
+    for name in upper:
+        query |= Q(**{name + '__trigram_word_similar': term})
+    similarities = [WordSimilarity(Value(term), expression) for expression in upper.values()]
+    similarity = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+    return queryset.annotate(**upper).filter(query).annotate(
+        search_similarity=similarity
+    ).order_by('-search_similarity')
@@ -1,6 +1,6 @@
 from django.conf import settings
 from rest_framework import serializers
-from .models import Resume, CustomUser, JobPosting, Application, Blog
+from .models import Resume, CustomUser, JobPosting, Application, Blog, ParseJob
 
 
 class CandidateSerializer(serializers.ModelSerializer):
@@ -21,10 +21,20 @@ class CandidateSerializer(serializers.ModelSerializer):
 class ResumeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Resume
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = ['user']
 
 
+class ParseJobSerializer(serializers.ModelSerializer):
+    status = serializers.CharField(source='get_status_display', read_only=True)
+    resume = ResumeSerializer(read_only=True)
+
+    class Meta:
+        model = ParseJob
+        fields = ['id', 'status', 'attempts', 'error', 'created_on', 'started_on', 'finished_on', 'resume']
+        read_only_fields = fields
+
+
 class RecruiterSerializer(serializers.ModelSerializer):
     class Meta:
         model = CustomUser
@@ -1,3 +1,270 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from resume_parser import metrics
+from resume_parser import utils
+from resume_parser import version
+from resume_parser.resume_parser import ResumeParser
+
+from .models import CustomUser, JobPosting, Resume
+from .search import (CANDIDATE_SEARCH_FIELDS, JOB_POSTING_KEYWORD_FIELDS, JOB_POSTING_SEARCH_FIELDS,
+                     RECRUITER_SEARCH_FIELDS, search_columns, search_resumes)
+
+SEED_ROWS = 100000
+MATCHING_ROWS = 20
+CITIES = ['Paris', 'Lyon', 'Marseille', 'Toulouse', 'Nantes', 'Lille', 'Bordeaux', 'Rennes']
+CATEGORIES = ['Informatique', 'Finance', 'Marketing', 'Logistique', 'Santé', 'Commerce']
+
+FRENCH_RESUME = (
+    'Jean Dupont\n'
+    "J'ai 5 ans d'expérience en Python\n"
+    'EXPÉRIENCE PROFESSIONNELLE\n'
+    'Développeur backend chez Acme, travail en équipe sur une API\n'
+    '  Formation  \n'
+    'Master en informatique\n'
+    'Compétences : Python, Django\n'
+    'Centres d\u2019intérêt\n'
+    'Randonnée\n'
+)
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), 'golden')
+GOLDEN_FILE = os.path.join(GOLDEN_DIR, 'expected.json')
+# fields recorded for the golden corpus, besides the raw text and its sections
+GOLDEN_FIELDS = ['email', 'mobile_number']
+
+DOCUMENT_XML = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+    '{}</w:body></w:document>'
+)
+
+
+def write_docx(path, paragraphs):
+    body = ''.join('<w:p><w:r><w:t>{}</w:t></w:r></w:p>'.format(text) for text in paragraphs)
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('word/document.xml', DOCUMENT_XML.format(body))
+
+
+def golden_results():
+    results = {}
+    for name in sorted(os.listdir(GOLDEN_DIR)):
+        if name == os.path.basename(GOLDEN_FILE):
+            continue
+        parser = ResumeParser(os.path.join(GOLDEN_DIR, name), fields=GOLDEN_FIELDS)
+        data = parser.get_extracted_data()
+        text_raw = parser.get_artifacts()['text_raw']
+        results[name] = dict(
+            {field: data[field] for field in GOLDEN_FIELDS},
+            text=text_raw,
+            sections={section: [list(span) for span in spans]
+                      for section, spans in utils.find_sections(text_raw).items()},
+        )
+    return results
+
+
+@skipUnless(connection.vendor == 'postgresql', 'search indexes only exist on Postgres')
+class SearchIndexTests(TestCase):
+    '''
+    Check on a seeded 100k-row dataset that searches are answered from the trigram and
+    full-text indexes rather than by scanning the tables
+    '''
+
+    @classmethod
+    def setUpTestData(cls):
+        step = SEED_ROWS // MATCHING_ROWS
+        users = []
+        for i in range(SEED_ROWS):
+            recruiter = i % 10 == 0
+            users.append(CustomUser(
+                email='utilisateur{}@exemple.fr'.format(i),
+                name='Yasmine Benali' if i % step == 1 else 'Utilisateur {}'.format(i),
+                role=CustomUser.RECRUITER if recruiter else CustomUser.CANDIDATE,
+                company=('Capgemini' if i % step == 0 else 'Société {}'.format(i % 500)) if recruiter else None,
+                position='Chargé de recrutement' if recruiter else None,
+            ))
+        CustomUser.objects.bulk_create(users, batch_size=5000)
+        recruiter = CustomUser.objects.filter(role=CustomUser.RECRUITER).first()
+
+        JobPosting.objects.bulk_create((JobPosting(
+            recruiter=recruiter,
+            title='Développeur Python' if i % step == 0 else 'Offre {}'.format(i),
+            description='Poste {} au sein d\'une équipe de {} personnes.'.format(i, i % 40),
+            city=CITIES[i % len(CITIES)],
+            category=CATEGORIES[i % len(CATEGORIES)],
+        ) for i in range(SEED_ROWS)), batch_size=5000)
+
+        Resume.objects.bulk_create((Resume(
+            name='Candidat {}'.format(i),
+            email='candidat{}@exemple.fr'.format(i),
+            skills='Kubernetes, Terraform' if i % step == 0 else 'Word, Excel',
+            education='Licence',
+            experience='Assistant administratif pendant {} ans'.format(i % 10),
+        ) for i in range(SEED_ROWS)), batch_size=5000)
+
+        with connection.cursor() as cursor:
+            for model in (CustomUser, JobPosting, Resume):
+                cursor.execute('ANALYZE {}'.format(model._meta.db_table))
+
+    def assertUsesIndexes(self, queryset, indexes):
+        plan = queryset.explain()
+        self.assertNotIn('Seq Scan', plan)
+        for index in indexes:
+            self.assertIn(index, plan)
+
+    def trigram_indexes(self, model, fields):
+        return ['{}_{}_trgm'.format(model._meta.db_table, field) for field in fields]
+
+    def test_candidate_search(self):
+        queryset = search_columns(CustomUser.objects.filter(role=CustomUser.CANDIDATE),
+                                  CANDIDATE_SEARCH_FIELDS, 'benali')
+        self.assertUsesIndexes(queryset, self.trigram_indexes(CustomUser, CANDIDATE_SEARCH_FIELDS))
+        self.assertTrue(queryset.exists())
+
+    def test_recruiter_search(self):
+        queryset = search_columns(CustomUser.objects.filter(role=CustomUser.RECRUITER),
+                                  RECRUITER_SEARCH_FIELDS, 'capgemini')
+        self.assertUsesIndexes(queryset, self.trigram_indexes(CustomUser, RECRUITER_SEARCH_FIELDS))
+        self.assertEqual(queryset.count(), MATCHING_ROWS)
+
+    def test_job_posting_search(self):
+        queryset = search_columns(JobPosting.objects.all(), JOB_POSTING_SEARCH_FIELDS, 'python')
+        self.assertUsesIndexes(queryset, self.trigram_indexes(JobPosting, JOB_POSTING_SEARCH_FIELDS))
+        self.assertEqual(queryset.count(), MATCHING_ROWS)
+
+    def test_job_posting_keywords(self):
+        queryset = search_columns(JobPosting.objects.filter(status=True).order_by('-created_on'),
+                                  JOB_POSTING_KEYWORD_FIELDS, 'python')
+        self.assertUsesIndexes(queryset, self.trigram_indexes(JobPosting, JOB_POSTING_KEYWORD_FIELDS))
+
+    def test_fuzzy_search_tolerates_typos(self):
+        queryset = search_columns(JobPosting.objects.all(), JOB_POSTING_SEARCH_FIELDS, 'pythn', fuzzy=True)
+        self.assertUsesIndexes(queryset, self.trigram_indexes(JobPosting, JOB_POSTING_SEARCH_FIELDS))
+        self.assertEqual(queryset.first().title, 'Développeur Python')
+
+        queryset = search_columns(CustomUser.objects.filter(role=CustomUser.CANDIDATE),
+                                  CANDIDATE_SEARCH_FIELDS, 'benal', fuzzy=True)
+        self.assertUsesIndexes(queryset, self.trigram_indexes(CustomUser, CANDIDATE_SEARCH_FIELDS))
+        self.assertEqual(queryset.first().name, 'Yasmine Benali')
+
+    def test_resume_full_text_search(self):
+        queryset = search_resumes(Resume.objects.all(), 'kubern')
+        self.assertUsesIndexes(queryset, ['parser_app_resume_search_vector_gin'])
+        self.assertEqual(queryset.count(), MATCHING_ROWS)
+
+
+class GoldenOutputTests(SimpleTestCase):
+    '''
+    Parse the corpus in parser_app/golden and compare with what was recorded for the
+    current PARSER_VERSION. When the output changes on purpose, bump PARSER_VERSION
+    and record it with ``UPDATE_GOLDEN=1 python manage.py test parser_app.tests.GoldenOutputTests``
+    '''
+
+    def test_output_matches_golden(self):
+        with open(GOLDEN_FILE, encoding='utf-8') as fh:
+            golden = json.load(fh)
+        results = golden_results()
+
+        if os.environ.get('UPDATE_GOLDEN'):
+            if results != golden['results'] and golden['parser_version'] == version.PARSER_VERSION:
+                self.fail('the output changed: bump PARSER_VERSION before recording it')
+            with open(GOLDEN_FILE, 'w', encoding='utf-8') as fh:
+                json.dump({'parser_version': version.PARSER_VERSION, 'results': results}, fh,
+                          ensure_ascii=False, indent=2, sort_keys=True)
+                fh.write('\n')
+            return
+
+        self.assertEqual(results, golden['results'],
+                         'the output changed: bump PARSER_VERSION and record it with UPDATE_GOLDEN=1')
+        self.assertEqual(golden['parser_version'], version.PARSER_VERSION,
+                         'PARSER_VERSION changed: record its output with UPDATE_GOLDEN=1')
+
+
+class SectionLexerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.sections = utils.find_sections(FRENCH_RESUME)
+
+    def lines(self, section):
+        return utils.section_lines(FRENCH_RESUME, self.sections[section])
+
+    def test_multi_word_accented_header(self):
+        # the mention of "expérience" inside a sentence is not a header
+        self.assertEqual(len(self.sections['experience']), 1)
+        self.assertEqual(self.lines('experience'), ['Développeur backend chez Acme, travail en équipe sur une API'])
+
+    def test_header_with_typographic_apostrophe(self):
+        self.assertEqual(self.lines('interests'), ['Randonnée'])
+
+    def test_inline_header(self):
+        self.assertEqual(self.lines('skills'), ['Python, Django'])
+
+    def test_sections_are_offsets_in_the_text(self):
+        self.assertEqual(list(self.sections), ['experience', 'education', 'skills', 'interests'])
+        start, end = self.sections['education'][0]
+        self.assertEqual(FRENCH_RESUME[start:end], '\nMaster en informatique\n')
+
+    def test_experience_feeds_competencies(self):
+        competencies = utils.extract_competencies(FRENCH_RESUME, self.lines('experience'), language='fr')
+        self.assertIn('teamwork', competencies)
+
+
+class ParseManyTests(SimpleTestCase):
+
+    def test_corrupt_file_does_not_stop_the_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corrupt = os.path.join(directory, 'corrupt.pdf')
+            with open(corrupt, 'wb') as fh:
+                fh.write(b'garbage%PDF')
+            good = os.path.join(directory, 'good.docx')
+            write_docx(good, ['Jean Dupont', 'jean.dupont@exemple.fr'])
+
+            results = list(ResumeParser.parse_many([corrupt, good], fields=['email']))
+
+        self.assertEqual([resume for resume, result in results], [corrupt, good])
+        failure, success = results[0][1], results[1][1]
+        self.assertFalse(failure['ok'])
+        self.assertEqual(failure['reason'], 'error')
+        self.assertIn('PDFSyntaxError', failure['error'])
+        self.assertIsNone(failure['data'])
+        self.assertTrue(success['ok'])
+        self.assertEqual(success['data']['email'], 'jean.dupont@exemple.fr')
+
+
+class MetricsDumpTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.registry = metrics.new_registry()
+        metrics.record(None, outcome='ok', registry=self.registry)
+
+    def write_dump(self, pid):
+        other = metrics.new_registry()
+        metrics.record(None, outcome='ok', registry=other)
+        with open(metrics.dump_path(self.directory, pid), 'w') as fh:
+            json.dump(other.snapshot(), fh)
+
+    def parsed(self):
+        for line in metrics.render(self.directory, registry=self.registry).splitlines():
+            if line.startswith('resume_parse_results_total{outcome="ok"} '):
+                return int(line.split()[-1])
+
+    def test_dumps_of_exited_processes_are_dropped(self):
+        # stays alive until its stdin is closed
+        process = subprocess.Popen([sys.executable, '-c', 'import sys; sys.stdin.read()'], stdin=subprocess.PIPE)
+        self.write_dump(process.pid)
+        self.write_dump(os.getppid())
+        self.assertEqual(self.parsed(), 3)
+
+        process.stdin.close()
+        process.wait()
+        self.assertEqual(self.parsed(), 2)
+        self.assertFalse(os.path.exists(metrics.dump_path(self.directory, process.pid)))
+        self.assertTrue(os.path.exists(metrics.dump_path(self.directory, os.getppid())))
@@ -19,7 +19,7 @@ from rest_framework.routers import DefaultRouter
 from . import admin_views, home_views, application_views, candidate_views
 from django.conf import settings
 from django.conf.urls.static import static
-from .api import ResumeUploadView, AdminStatsView, CVRegistrationRateView, RecruiterStatsView, CandidateStatsView, ApplicationRateView
+from .api import ResumeUploadView, ParseJobView, MetricsView, AdminStatsView, CVRegistrationRateView, RecruiterStatsView, CandidateStatsView, ApplicationRateView
 from .auth_views import LoginView, RecruiterRegisterView, CandidateRegisterView, RequestPasswordResetView, ResetPasswordView
 # from .auth_views import RegisterView
 
@@ -44,12 +44,14 @@ urlpatterns = [
     # path('', views.homepage, name='homepage'),
     # path('api/v1/auth/signup/', RegisterView.as_view(), name='register'),
     path('api/v1/admin/resumes/upload/', ResumeUploadView.as_view(), name='upload-resumes'),
+    path('api/v1/parse-jobs/<int:pk>/', ParseJobView.as_view(), name='parse-job'),
     path('api/v1/auth/signup/recruiter/', RecruiterRegisterView.as_view(), name='recruiter-register'),
     path('api/v1/auth/signup/candidate/', CandidateRegisterView.as_view(), name='candidate-register'),
     path('api/v1/auth/signin/', LoginView.as_view(), name='login'),
     path('api/password/email/', RequestPasswordResetView.as_view(), name='request_password_reset'),
     path('api/password/reset/', ResetPasswordView.as_view(), name='reset_password'),
     path('api/v1/admin/stats/', AdminStatsView.as_view(), name='stats'),
+    path('api/v1/admin/metrics/', MetricsView.as_view(), name='metrics'),
     path('api/v1/recruiter/stats/', RecruiterStatsView.as_view(), name='recruiter-stats'),
     path('api/v1/candidate/stats/', CandidateStatsView.as_view(), name='candidate-stats'),
     path('api/v1/stats/cv-registration-rate/', CVRegistrationRateView.as_view(), name='cv_registration_rate'),
@@ -1,11 +1,9 @@
 from django.shortcuts import render, redirect
-from resume_parser.resume_parser import ResumeParser
+from .parsing import enqueue_resume
 from .models import Resume, UploadResumeModelForm
 from django.contrib import messages
-from django.conf import settings
 from django.db import IntegrityError
 from django.http import HttpResponse, FileResponse, Http404
-import os
 
 
 def homepage(request):
@@ -13,59 +11,17 @@ def homepage(request):
         Resume.objects.all().delete()
         file_form = UploadResumeModelForm(request.POST, request.FILES)
         files = request.FILES.getlist('resume')
-        resumes_data = []
         if file_form.is_valid():
             for file in files:
                 try:
-                    # saving the file
+                    # saving the file, extracting resume entities is done by the `parse_worker` command
                     resume = Resume(resume=file)
-                    resume.save()
-                    
-                    # extracting resume entities
-                    parser = ResumeParser(os.path.join(settings.MEDIA_ROOT, resume.resume.name))
-                    data = parser.get_extracted_data()
-                    resumes_data.append(data)
-                    resume.name               = data.get('name')
-                    resume.email              = data.get('email')
-                    resume.mobile_number      = data.get('mobile_number')
-                    # if data.get('degree') is not None:
-                    #     resume.education      = ', '.join(data.get('degree'))
-                    # else:
-                    #     resume.education      = None
-                    education = data.get('education')
-                    if education:
-                        if isinstance(education, list):
-                            resume.education = ', '.join(education)
-                        else:
-                            resume.education = education
-                    else:
-                        resume.education = None
-                    # resume.company_names      = data.get('company_names')
-                    # resume.college_name       = data.get('college_name')
-                    # resume.designation        = data.get('designation')
-                    # resume.total_experience   = data.get('total_experience')
-                    if data.get('skills') is not None:
-                        resume.skills         = ', '.join(data.get('skills'))
-                    else:
-                        resume.skills         = None
-                    # if data.get('experience') is not None:
-                    #     resume.experience     = ', '.join(data.get('experience'))
-                    # else:
-                    #     resume.experience     = None
-                    experience = data.get('experience')
-                    if experience:
-                        if isinstance(experience, list):
-                            resume.experience = ', '.join(experience)
-                        else:
-                            resume.experience = experience
-                    else:
-                        resume.experience = None
-                    resume.save()
+                    enqueue_resume(resume, upload=file)
                 except IntegrityError:
                     messages.warning(request, 'Duplicate resume found:', file.name)
                     return redirect('homepage')
             resumes = Resume.objects.all()
-            messages.success(request, 'Resumes uploaded!')
+            messages.success(request, 'Resumes uploaded! They will be parsed shortly.')
             context = {
                 'resumes': resumes,
             }
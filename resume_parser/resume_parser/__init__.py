@@ -1,3 +1,12 @@
-from .resume_parser import ResumeParser
+# The package is also the Django project (settings, urls, wsgi), so the parser
+# and its spaCy / NLTK / pdfminer imports are only loaded when first accessed
+from .version import PARSER_VERSION
 
-__all__ = ['ResumeParser']
\ No newline at end of file
+__all__ = ['ResumeParser', 'PARSER_VERSION']
+
+
+def __getattr__(name):
+    if name == 'ResumeParser':
+        from .resume_parser import ResumeParser
+        return ResumeParser
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
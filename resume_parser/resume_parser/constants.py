@@ -1,5 +1,3 @@
-from nltk.corpus import stopwords
-
 NAME_PATTERN = [
     {'POS': 'PROPN'},
     {'POS': 'PROPN', 'OP': '?'},
@@ -34,39 +32,47 @@ MONTHS_LONG       = r'''(january)|(february)|(march)|(april)|(may)|(june)|(july)
 MONTH             = r'(' + MONTHS_SHORT + r'|' + MONTHS_LONG + r')'
 YEAR              = r'(((20|19)(\d{2})))'
 
-STOPWORDS         = set(stopwords.words('french'))
+# Extraction budgets, long portfolios are cut off rather than parsed in full
+PDF_MAX_PAGES     = 20
+TEXT_MAX_CHARS    = 100000
+# spaCy refuses longer texts, keep it in line with the extraction budget
+NLP_MAX_LENGTH    = TEXT_MAX_CHARS
+# 'spacy' derives experience from the parsed Doc, 'nltk' re-tags the text with NLTK (slower)
+EXPERIENCE_BACKEND = 'spacy'
+
+# Opt-in parallel PDF extraction only kicks in from this many pages
+PDF_PARALLEL_MIN_PAGES = 8
 
-RESUME_SECTIONS = [
-                    'accomplishments',
-                    'experience',
-                    'education',
-                    'interests',
-                    'projects',
-                    'professional experience',
-                    'publications',
-                    'skills',
-                    'accomplissements',
-                    'expérience',
-                    'centres d\'intérêt',
-                    'expériences professionnelles',
-                    'formation',
-                    'intérêts',
-                    'coordonnées',
-                    'langues',
-                    'éducation',
-                    'projets',
-                    'expérience professionnelle',
-                    'publications',
-                    'compétences',
-                    'certifications',
-                    'badges',
-                    'certificats',
-                    'objectif',
-                    'objectif de carrière',
-                    'résumé',
-                    'volontariat',
-                    'diplômes',
-                ]
+# Supported resume languages: spaCy model and NLTK stopword list of each
+LANGUAGE_MODELS    = {'fr': 'fr_core_news_sm', 'en': 'en_core_web_sm'}
+LANGUAGE_STOPWORDS = {'fr': 'french', 'en': 'english'}
+DEFAULT_LANGUAGE   = 'fr'
+# Language detection only reads the start of the text, and keeps the default
+# language when fewer words than this share are stopwords of either language
+LANGUAGE_SAMPLE_CHARS       = 5000
+LANGUAGE_MIN_STOPWORD_RATIO = 0.02
+
+# Section headers, grouped by the section they open. Matched on whole lines
+# (optionally followed by ':'), ignoring case and accents.
+RESUME_SECTIONS = {
+    'experience': [
+        'experience', 'experiences', 'professional experience', 'work experience', 'internships',
+        'expérience', 'expériences', 'expérience professionnelle', 'expériences professionnelles',
+        'parcours professionnel', 'stages',
+    ],
+    'education': ['education', 'éducation', 'formation', 'formations', 'diplômes', 'cursus'],
+    'skills': ['skills', 'technical skills', 'compétences', 'compétences techniques'],
+    'projects': ['projects', 'projets', 'projets académiques', 'academic projects'],
+    'accomplishments': ['accomplishments', 'accomplissements'],
+    'interests': ['interests', 'intérêts', "centres d'intérêt", "centres d'intérêts"],
+    'publications': ['publications'],
+    'certifications': ['certifications', 'certificats', 'badges'],
+    'languages': ['languages', 'langues'],
+    'contact': ['contact', 'coordonnées'],
+    'objective': ['objective', 'career objective', 'objectif', 'objectif de carrière'],
+    'summary': ['summary', 'résumé', 'profil', 'profile'],
+    'volunteering': ['volunteering', 'volontariat', 'bénévolat'],
+}
 
 COMPETENCIES = {
     'teamwork': [
@@ -461,4 +467,62 @@ MEASURABLE_RESULTS = {
         'create',
         'created'
     ]
-}
\ No newline at end of file
+}
+# French phrases added to the lexicons above for French resumes, which
+# often mix in English action verbs, so the English phrases are kept too
+COMPETENCIES_FR = {
+    'teamwork': [
+        'travail en équipe', 'équipe', 'encadré', 'coordonné', 'organisé', 'participé',
+        'collaboré', 'accompagné', 'assisté', 'contribué', 'supervisé'
+    ],
+    'communication': [
+        'présenté', 'rédigé', 'rédaction', 'animé', 'formé', 'négocié', 'communication',
+        'proposé', 'traduit', 'cahier des charges'
+    ],
+    'analytical': [
+        'analysé', 'analyse', 'conçu', 'développé', 'identifié', 'estimé', 'optimisé',
+        'mesuré', 'planifié', 'étude', 'budget'
+    ],
+    'result_driven': [
+        'amélioré', 'réduit', 'augmenté', 'accéléré', 'résolu', 'corrigé', 'atteint',
+        'économisé', 'optimisé'
+    ],
+    'leadership': [
+        'dirigé', 'géré', 'piloté', 'encadré', 'mis en place', 'lancé', 'fondé',
+        'implémenté', 'délégué', 'supervisé'
+    ]
+}
+
+MEASURABLE_RESULTS_FR = {
+    'metrics': [
+        'augmentation', 'réduction', 'économies', 'millions', 'milliers', 'pourcent',
+        "chiffre d'affaires", 'croissance', 'ventes', 'budget', 'délai', 'moyenne'
+    ],
+    'action_words': [
+        'développé', 'dirigé', 'analysé', 'conçu', 'réalisé', 'mis en place', 'implémenté',
+        'optimisé', 'amélioré', 'lancé', 'piloté', 'déployé', 'automatisé', 'migré',
+        'intégré', 'validé', 'testé', 'supervisé', 'coordonné', 'organisé', 'présenté'
+    ],
+    'weak_words': [
+        'je', "j'ai", 'nous', 'notre', 'aidé', 'essayé', 'participé'
+    ]
+}
+
+COMPETENCIES_BY_LANGUAGE = {
+    'en': COMPETENCIES,
+    'fr': {category: phrases + COMPETENCIES_FR.get(category, []) for category, phrases in COMPETENCIES.items()},
+}
+
+MEASURABLE_RESULTS_BY_LANGUAGE = {
+    'en': MEASURABLE_RESULTS,
+    'fr': {category: phrases + MEASURABLE_RESULTS_FR.get(category, [])
+           for category, phrases in MEASURABLE_RESULTS.items()},
+}
+
+
+def __getattr__(name):
+    # STOPWORDS reads the NLTK corpus, only do it when someone asks for it
+    if name == 'STOPWORDS':
+        from .language import stopwords
+        return stopwords('fr')
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
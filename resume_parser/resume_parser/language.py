@@ -0,0 +1,69 @@
+import re
+import threading
+
+from nltk.corpus import stopwords as nltk_stopwords
+
+from . import constants as cs
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+_stopwords = {}
+_distinctive = None
+_lock = threading.Lock()
+
+
+def stopwords(language):
+    '''
+    NLTK stopwords of `language`, read once per process
+
+    :param language: key of `constants.LANGUAGE_STOPWORDS`
+    :return: frozenset of lowercase words
+    '''
+    words = _stopwords.get(language)
+    if words is None:
+        words = frozenset(nltk_stopwords.words(cs.LANGUAGE_STOPWORDS[language]))
+        _stopwords[language] = words
+    return words
+
+
+def _distinctive_stopwords():
+    # words that are stopwords of several languages (e.g. 'a', 'on') say nothing
+    global _distinctive
+    if _distinctive is None:
+        with _lock:
+            if _distinctive is None:
+                counts = {}
+                for language in cs.LANGUAGE_STOPWORDS:
+                    for word in stopwords(language):
+                        counts[word] = counts.get(word, 0) + 1
+                _distinctive = {language: frozenset(word for word in stopwords(language) if counts[word] == 1)
+                                for language in cs.LANGUAGE_STOPWORDS}
+    return _distinctive
+
+
+def detect_language(text, sample_chars=cs.LANGUAGE_SAMPLE_CHARS):
+    '''
+    Guess the language of a resume from the share of its words that are
+    stopwords of each supported language. Only the first `sample_chars`
+    characters are read.
+
+    :param text: resume text
+    :return: key of `constants.LANGUAGE_MODELS`, `constants.DEFAULT_LANGUAGE`
+             when no language stands out
+    '''
+    words = _WORD.findall(text[:sample_chars].lower())
+    if not words:
+        return cs.DEFAULT_LANGUAGE
+    hits = {language: sum(1 for word in words if word in distinctive)
+            for language, distinctive in _distinctive_stopwords().items()}
+    language = max(sorted(hits), key=hits.get)
+    if hits[language] < cs.LANGUAGE_MIN_STOPWORD_RATIO * len(words):
+        return cs.DEFAULT_LANGUAGE
+    return language
+
+
+def model_for(language):
+    '''
+    :return: name of the spaCy model for `language`
+    '''
+    return cs.LANGUAGE_MODELS.get(language, cs.LANGUAGE_MODELS[cs.DEFAULT_LANGUAGE])
@@ -0,0 +1,236 @@
+import atexit
+import glob
+import json
+import os
+import socket
+import threading
+
+# seconds, from a fast regex extractor to a pathological PDF
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 40)
+SIZE_BUCKETS = (1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+
+class Histogram(object):
+    '''
+    Minimal Prometheus-style histogram with labels. Counts are stored per
+    bucket and rendered cumulatively.
+    '''
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def observe(self, value, *labels):
+        series = self.values.setdefault(labels, {'buckets': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0})
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        series['buckets'][index] += 1
+        series['sum'] += value
+        series['count'] += 1
+
+    def merge(self, values):
+        for labels, other in values.items():
+            series = self.values.setdefault(labels, {'buckets': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0})
+            series['buckets'] = [a + b for a, b in zip(series['buckets'], other['buckets'])]
+            series['sum'] += other['sum']
+            series['count'] += other['count']
+
+    def render(self):
+        lines = []
+        for labels, series in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series['buckets']):
+                cumulative += count
+                lines.append('{}_bucket{} {}'.format(self.name, _labels(self.labelnames + ('le',), labels + (bound,)), cumulative))
+            lines.append('{}_sum{} {}'.format(self.name, _labels(self.labelnames, labels), series['sum']))
+            lines.append('{}_count{} {}'.format(self.name, _labels(self.labelnames, labels), series['count']))
+        return lines
+
+
+class Counter(object):
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def merge(self, values):
+        for labels, value in values.items():
+            self.inc(*labels, amount=value)
+
+    def render(self):
+        return ['{}{} {}'.format(self.name, _labels(self.labelnames, labels), value)
+                for labels, value in sorted(self.values.items())]
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(name, value) for name, value in zip(names, values)) + '}'
+
+
+class Registry(object):
+    def __init__(self, metrics):
+        self.metrics = {metric.name: metric for metric in metrics}
+        self.lock = threading.Lock()
+        self.dumped = set()
+
+    def snapshot(self):
+        with self.lock:
+            return {name: [[list(labels), value] for labels, value in metric.values.items()]
+                    for name, metric in self.metrics.items()}
+
+    def merge(self, snapshot):
+        with self.lock:
+            for name, values in snapshot.items():
+                if name in self.metrics:
+                    self.metrics[name].merge({tuple(labels): value for labels, value in values})
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for metric in self.metrics.values():
+                lines.append('# HELP {} {}'.format(metric.name, metric.documentation))
+                lines.append('# TYPE {} {}'.format(metric.name, metric.kind))
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, directory):
+        '''
+        Write this process' values to `<directory>/<host>-<pid>.json`, so that another
+        process (e.g. the web worker serving /metrics) can merge them. The file is
+        removed when the process exits.
+        '''
+        os.makedirs(directory, exist_ok=True)
+        path = dump_path(directory)
+        with open(path + '.tmp', 'w') as fh:
+            json.dump(self.snapshot(), fh)
+        os.replace(path + '.tmp', path)
+        if path not in self.dumped:
+            self.dumped.add(path)
+            atexit.register(_remove, path)
+
+
+def dump_path(directory, pid=None):
+    # the host name keeps processes of different containers sharing the directory apart
+    return os.path.join(directory, '{}-{}.json'.format(socket.gethostname(), pid or os.getpid()))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def new_registry():
+    return Registry([
+        Histogram('resume_parse_seconds', 'Wall-clock time of a whole resume parse.', TIME_BUCKETS),
+        Histogram('resume_parse_stage_seconds', 'Exclusive time spent building each parse stage.', TIME_BUCKETS, ('stage',)),
+        Histogram('resume_parse_field_seconds', 'Exclusive time spent in each field extractor.', TIME_BUCKETS, ('field',)),
+        Histogram('resume_parse_pages', 'Pages of parsed PDF resumes.', PAGE_BUCKETS),
+        Histogram('resume_parse_characters', 'Characters of extracted resume text.', SIZE_BUCKETS),
+        Histogram('resume_parse_tokens', 'spaCy tokens of parsed resumes.', SIZE_BUCKETS),
+        Counter('resume_parse_results_total', 'Parses by outcome (ok, timeout, memory, error).', ('outcome',)),
+    ])
+
+
+REGISTRY = new_registry()
+
+
+def record(parse_metrics, elapsed=None, outcome='ok', registry=REGISTRY):
+    '''
+    Add one parse to the histograms
+
+    :param parse_metrics: dictionary returned by `ResumeParser.get_metrics`, may be None for failures
+    :param elapsed: total seconds of the parse
+    :param outcome: 'ok' or the failure reason
+    '''
+    with registry.lock:
+        metrics = registry.metrics
+        metrics['resume_parse_results_total'].inc(outcome)
+        if elapsed is not None:
+            metrics['resume_parse_seconds'].observe(elapsed)
+        if not parse_metrics:
+            return
+        for stage, seconds in parse_metrics['stages'].items():
+            metrics['resume_parse_stage_seconds'].observe(seconds, stage)
+        for field, seconds in parse_metrics['fields'].items():
+            metrics['resume_parse_field_seconds'].observe(seconds, field)
+        for size in ('pages', 'characters', 'tokens'):
+            if parse_metrics.get(size) is not None:
+                metrics['resume_parse_' + size].observe(parse_metrics[size])
+
+
+def record_result(result, registry=REGISTRY):
+    '''
+    Add a parse result (see `resume_parser.parse_result`) to the histograms
+    '''
+    record(result.get('metrics'), result.get('elapsed'), result['reason'] or 'ok', registry)
+
+
+def render(directory=None, registry=REGISTRY):
+    '''
+    Prometheus text exposition of this process' metrics, merged with the
+    snapshots other processes dumped into `directory`. Snapshots left behind by
+    processes of this host that died without cleaning up are deleted.
+    '''
+    if not directory:
+        return registry.render()
+    merged = new_registry()
+    merged.merge(registry.snapshot())
+    prefix = socket.gethostname() + '-'
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        if path == dump_path(directory):
+            continue
+        name = os.path.basename(path)[:-len('.json')]
+        if name.startswith(prefix) and name[len(prefix):].isdigit() and not _is_running(int(name[len(prefix):])):
+            _remove(path)
+            continue
+        try:
+            with open(path) as fh:
+                merged.merge(json.load(fh))
+        except (OSError, ValueError):
+            continue
+    return merged.render()
+
+
+def summary(registry=REGISTRY):
+    '''
+    Human readable per-stage / per-field breakdown, used by the CLI `--profile` flag
+    '''
+    with registry.lock:
+        metrics = registry.metrics
+        lines = []
+        total = sum(series['sum'] for series in metrics['resume_parse_stage_seconds'].values.values()) + \
+            sum(series['sum'] for series in metrics['resume_parse_field_seconds'].values.values())
+        for title, name in (('stage', 'resume_parse_stage_seconds'), ('field', 'resume_parse_field_seconds')):
+            for labels, series in sorted(metrics[name].values.items(), key=lambda item: -item[1]['sum']):
+                lines.append('{:<6} {:<20} n={:<6} total={:9.1f}ms  mean={:8.2f}ms  {:5.1f}%'.format(
+                    title, labels[0], series['count'], series['sum'] * 1000,
+                    series['sum'] * 1000 / series['count'], 100 * series['sum'] / total if total else 0))
+        for size in ('pages', 'characters', 'tokens'):
+            for labels, series in metrics['resume_parse_' + size].values.items():
+                lines.append('input  {:<20} n={:<6} mean={:.0f}'.format(size, series['count'], series['sum'] / series['count']))
+        for labels, value in sorted(metrics['resume_parse_results_total'].values.items()):
+            lines.append('result {:<20} {}'.format(labels[0], value))
+    return '\n'.join(lines)
@@ -0,0 +1,179 @@
+import threading
+import time
+
+import spacy
+from spacy.matcher import Matcher
+from spacy.tokens import DocBin
+
+from . import constants as cs
+from .skills_index import get_skills_index
+
+DEFAULT_MODEL = cs.LANGUAGE_MODELS[cs.DEFAULT_LANGUAGE]
+
+# components the parser never reads, not even loaded
+EXCLUDED_COMPONENTS = ('ner',)
+
+# parsing profiles, mapped to the loaded components they switch off:
+# 'full' keeps the dependency parse for noun chunks, 'fast' only tags and
+# relies on the rule-based sentencizer for sentence boundaries
+PROFILES = {
+    'full': (),
+    'fast': ('parser',),
+}
+
+# one entry per spaCy model name, shared by every ResumeParser in the process
+_pipelines = {}
+_matchers = {}
+_lock = threading.Lock()
+
+
+def get_nlp(model=DEFAULT_MODEL):
+    '''
+    Return the process-wide spaCy pipeline for `model`, loading it on first use
+
+    :param model: name of the installed spaCy model
+    :return: object of `spacy.language.Language`
+    '''
+    nlp = _pipelines.get(model)
+    if nlp is None:
+        with _lock:
+            nlp = _pipelines.get(model)
+            if nlp is None:
+                nlp = spacy.load(model, disable=list(EXCLUDED_COMPONENTS))
+                # only sets boundaries the parser left unset, so it is a
+                # no-op for 'full' and the sentence splitter for 'fast'
+                nlp.add_pipe(nlp.create_pipe('sentencizer'), last=True)
+                nlp.max_length = cs.NLP_MAX_LENGTH
+                # compile the multi-word skills with this model's tokenizer
+                get_skills_index().phrase_matcher(nlp.vocab, nlp.make_doc)
+                _pipelines[model] = nlp
+    return nlp
+
+
+def get_matcher(model=DEFAULT_MODEL):
+    '''
+    Return the process-wide `Matcher` bound to the vocab of `model`,
+    with the name pattern already registered
+
+    :param model: name of the installed spaCy model
+    :return: object of `spacy.matcher.Matcher`
+    '''
+    matcher = _matchers.get(model)
+    if matcher is None:
+        nlp = get_nlp(model)
+        with _lock:
+            matcher = _matchers.get(model)
+            if matcher is None:
+                matcher = Matcher(nlp.vocab)
+                matcher.add('NAME', None, cs.NAME_PATTERN)
+                _matchers[model] = matcher
+    return matcher
+
+
+def process(text, profile='full', model=DEFAULT_MODEL):
+    '''
+    Run the shared pipeline over `text` with the components of `profile`.
+    Text longer than `constants.NLP_MAX_LENGTH` is cut off.
+
+    :param text: whitespace-normalized resume text
+    :param profile: key of `PROFILES`
+    :return: object of `spacy.tokens.doc.Doc`
+    '''
+    nlp = get_nlp(model)
+    disabled = PROFILES[profile]
+    doc = nlp.make_doc(text[:nlp.max_length])
+    for name, component in nlp.pipeline:
+        if name not in disabled:
+            doc = component(doc)
+    return doc
+
+
+def pipe(texts, profile='full', model=DEFAULT_MODEL, **kwargs):
+    '''
+    Batched `process`, `kwargs` are passed on to `nlp.pipe`
+    (batch_size, n_process, as_tuples...)
+    '''
+    nlp = get_nlp(model)
+    if kwargs.get('as_tuples'):
+        texts = ((text[:nlp.max_length], context) for text, context in texts)
+    else:
+        texts = (text[:nlp.max_length] for text in texts)
+    return nlp.pipe(texts, disable=list(PROFILES[profile]), **kwargs)
+
+
+def component_costs(texts, profile='full', model=DEFAULT_MODEL):
+    '''
+    Time each stage of Doc construction (tokenizer then every enabled
+    component) over `texts`
+
+    :return: list of (component name, seconds) in pipeline order
+    '''
+    nlp = get_nlp(model)
+    disabled = PROFILES[profile]
+    costs = [['tokenizer', 0.0]] + [[name, 0.0] for name, component in nlp.pipeline if name not in disabled]
+    for text in texts:
+        start = time.perf_counter()
+        doc = nlp.make_doc(text[:nlp.max_length])
+        costs[0][1] += time.perf_counter() - start
+        for cost in costs[1:]:
+            start = time.perf_counter()
+            doc = nlp.get_pipe(cost[0])(doc)
+            cost[1] += time.perf_counter() - start
+    return [tuple(cost) for cost in costs]
+
+
+def model_version(model=DEFAULT_MODEL):
+    '''
+    Name and version of the installed `model`, e.g. 'fr_core_news_sm-2.3.0'.
+    Docs serialized with one version are not reused with another.
+    '''
+    meta = get_nlp(model).meta
+    return '{}_{}-{}'.format(meta['lang'], meta['name'], meta['version'])
+
+
+def doc_to_bytes(doc):
+    '''
+    Serialize the annotations the extractors read (tags, lemmas and either the
+    dependency parse or the sentence boundaries) with `DocBin`
+
+    :param doc: object of `spacy.tokens.doc.Doc`
+    :return: compressed bytes, see `doc_from_bytes`
+    '''
+    # spaCy refuses to restore both HEAD and SENT_START, a parsed Doc gets
+    # its sentences back from the parse
+    boundaries = ('HEAD', 'DEP') if doc.is_parsed else ('SENT_START',)
+    doc_bin = DocBin(attrs=('TAG', 'POS', 'LEMMA') + boundaries)
+    doc_bin.add(doc)
+    return doc_bin.to_bytes()
+
+
+def doc_from_bytes(data, model=DEFAULT_MODEL):
+    '''
+    Rebuild a Doc serialized by `doc_to_bytes` against the vocab of `model`,
+    without running the pipeline
+
+    :return: object of `spacy.tokens.doc.Doc`
+    '''
+    vocab = get_nlp(model).vocab
+    return next(DocBin().from_bytes(data).get_docs(vocab))
+
+
+def warm_up(models=(DEFAULT_MODEL,)):
+    '''
+    Load the given models (their matchers and the skills index) ahead of the first request,
+    e.g. at worker boot or in a multiprocessing pool initializer
+
+    :param models: iterable of spaCy model names
+    '''
+    for model in models:
+        get_matcher(model)
+
+
+def clear():
+    '''
+    Drop every cached pipeline and matcher (used by the benchmarks to
+    reproduce a cold load per resume)
+    '''
+    with _lock:
+        _pipelines.clear()
+        _matchers.clear()
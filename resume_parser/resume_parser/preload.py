@@ -0,0 +1,38 @@
+import gc
+import time
+
+import nltk
+from nltk.stem import WordNetLemmatizer
+
+from . import constants as cs
+from . import nlp_registry
+from . import utils
+from .skills_index import get_skills_index
+
+
+def preload_resources(models=None, freeze=True):
+    '''
+    Load everything the parser reads lazily: the spaCy models with their
+    matchers, the skills index, the stopword lists and, for the NLTK
+    experience backend, the tokenizer, tagger and lemmatizer data.
+
+    Meant to run once in a process that forks parsing children (`parse_worker`,
+    `reparse_resumes`) before it forks, so the children share these pages
+    copy-on-write.
+
+    :param models: iterable of spaCy model names, None for every supported language
+    :param freeze: move the loaded objects out of the cyclic GC's reach (`gc.freeze`),
+                   so collections in the children don't write to the shared pages
+    :return: seconds spent loading
+    '''
+    start = time.perf_counter()
+    nlp_registry.warm_up(cs.LANGUAGE_MODELS.values() if models is None else models)
+    get_skills_index()
+    utils.experience_stopwords()
+    if cs.EXPERIENCE_BACKEND == 'nltk':
+        nltk.pos_tag(nltk.word_tokenize('Preloading the NLTK resources'))
+        WordNetLemmatizer().lemmatize('resources')
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return time.perf_counter() - start
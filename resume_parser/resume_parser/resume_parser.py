@@ -1,15 +1,67 @@
 import os
+import time
 from . import utils
-import spacy
+from . import constants as cs
+from . import nlp_registry
+from . import metrics
+from .language import detect_language, model_for
 import pprint
-from spacy.matcher import Matcher
 import multiprocessing as mp
 
 
 class ResumeParser(object):
-    def __init__(self, resume):
-        nlp = spacy.load('fr_core_news_sm')
-        self.__matcher = Matcher(nlp.vocab)
+    # intermediate results and the stages each of them is computed from
+    STAGES = {
+        'text_raw': (),
+        'text'    : ('text_raw',),
+        'language': ('text',),
+        'doc'     : ('text', 'language'),
+        'sections': ('text_raw',),
+    }
+
+    # extracted fields and the stages their extractor reads
+    FIELDS = {
+        'name'              : ('doc',),
+        'email'             : ('text',),
+        'mobile_number'     : ('text',),
+        'skills'            : ('doc',),
+        'education'         : ('doc',),
+        'experience'        : ('doc',),
+        'competencies'      : ('text_raw', 'sections', 'language'),
+        'measurable_results': ('text_raw', 'sections', 'language'),
+    }
+
+    # fields reading noun chunks, which need the dependency parse ('full' profile);
+    # everything else gets by with the tagger and sentencizer ('fast' profile)
+    NOUN_CHUNK_FIELDS = ('skills',)
+
+    def __init__(self, resume, fields=None, page_workers=None, page_threshold=cs.PDF_PARALLEL_MIN_PAGES,
+                 experience_backend=cs.EXPERIENCE_BACKEND, extension=None):
+        '''
+        :param resume: path of the resume to parse, or its content as bytes or a binary
+                       file-like object (e.g. a Django `UploadedFile`), read without a disk round-trip
+        :param fields: iterable of names from `FIELDS` to extract, None for all.
+                       Only the stages those fields need are computed, e.g.
+                       email and mobile_number alone never load spaCy.
+        :param extension: '.pdf', '.docx' or '.doc', guessed from the name or content when None
+        '''
+        self.__setup(resume, fields, experience_backend, {}, page_workers, page_threshold, extension)
+        self.__get_basic_details()
+
+    def __setup(self, resume, fields, experience_backend, stages,
+                page_workers=None, page_threshold=cs.PDF_PARALLEL_MIN_PAGES, extension=None):
+        self.__resume = resume
+        self.__extension = extension
+        self.__fields = list(self.FIELDS) if fields is None else list(fields)
+        unknown = set(self.__fields) - set(self.FIELDS)
+        if unknown:
+            raise ValueError('Unknown resume fields: {}'.format(', '.join(sorted(unknown))))
+        self.__experience_backend = experience_backend
+        self.__page_workers = page_workers
+        self.__page_threshold = page_threshold
+        self.__stages = stages
+        self.__timings = {'stages': {}, 'fields': {}}
+        self.__profile = self.nlp_profile(self.__fields)
         self.__details = {
             'name'              : None,
             'email'             : None,
@@ -20,55 +72,312 @@ class ResumeParser(object):
             'competencies'      : None,
             'measurable_results': None
         }
-        self.__resume      = resume
-        self.__text_raw    = utils.extract_text(self.__resume, os.path.splitext(self.__resume)[1])
-        self.__text        = ' '.join(self.__text_raw.split())
-        self.__nlp         = nlp(self.__text)
-        self.__noun_chunks = list(self.__nlp.noun_chunks)
-        self.__get_basic_details()
+
+    @classmethod
+    def required_stages(cls, fields=None, experience_backend=cs.EXPERIENCE_BACKEND):
+        '''
+        Set of stages needed to extract `fields` (all fields when None)
+        '''
+        pending = []
+        for field in (cls.FIELDS if fields is None else fields):
+            pending.extend(cls.__field_stages(field, experience_backend))
+        stages = set()
+        while pending:
+            stage = pending.pop()
+            if stage not in stages:
+                stages.add(stage)
+                pending.extend(cls.STAGES[stage])
+        return stages
+
+    @classmethod
+    def __field_stages(cls, field, experience_backend):
+        if field == 'experience' and experience_backend == 'nltk':
+            return ('text', 'language')
+        return cls.FIELDS[field]
+
+    @classmethod
+    def nlp_profile(cls, fields=None):
+        '''
+        Name of the `nlp_registry.PROFILES` entry needed to extract `fields`
+        '''
+        fields = cls.FIELDS if fields is None else fields
+        return 'full' if any(field in cls.NOUN_CHUNK_FIELDS for field in fields) else 'fast'
+
+    @classmethod
+    def from_doc(cls, resume, text_raw, doc=None, fields=None, experience_backend=cs.EXPERIENCE_BACKEND):
+        '''
+        Build a parser from text and a Doc that were produced elsewhere (e.g. by `nlp.pipe`)
+
+        :param resume: path of the resume the text was extracted from
+        :param text_raw: raw text as returned by `utils.extract_text`
+        :param doc: object of `spacy.tokens.doc.Doc` for the whitespace-normalized text,
+                    may be None when none of `fields` needs it. The resume language
+                    is the language of the model that built it.
+        :param fields: iterable of names from `FIELDS` to extract, None for all
+        :param experience_backend: 'spacy' or 'nltk', see `constants.EXPERIENCE_BACKEND`
+        '''
+        stages = {'text_raw': text_raw}
+        if doc is not None:
+            stages['text'] = doc.text
+            stages['language'] = doc.lang_
+            stages['doc'] = doc
+        parser = cls.__new__(cls)
+        parser.__setup(resume, fields, experience_backend, stages)
+        parser.__get_basic_details()
+        return parser
+
+    @classmethod
+    def parse_many(cls, resumes, batch_size=32, n_process=1, extract_workers=1, fields=None,
+                   experience_backend=cs.EXPERIENCE_BACKEND):
+        '''
+        Parse many resumes, running spaCy over them in batches with `nlp.pipe`.
+        Texts are grouped by detected language within each chunk of
+        `batch_size * n_process` resumes, so every model sees whole batches.
+
+        :param resumes: iterable of resume paths
+        :param batch_size: number of texts per `nlp.pipe` batch
+        :param n_process: number of processes used by `nlp.pipe`
+        :param extract_workers: number of processes extracting text from the files
+        :param fields: iterable of names from `FIELDS` to extract, None for all
+        :param experience_backend: 'spacy' or 'nltk', see `constants.EXPERIENCE_BACKEND`
+        :return: iterator of (resume, result) tuples, in input order. A resume that can't be
+                 read or parsed gets a failure result instead of stopping the run, see `parse_result`.
+        '''
+        needs_doc = 'doc' in cls.required_stages(fields, experience_backend)
+        pool = mp.Pool(extract_workers) if extract_workers > 1 else None
+        try:
+            if pool is not None:
+                texts = pool.imap(_extract_text, resumes, chunksize=max(1, batch_size // extract_workers))
+            else:
+                texts = map(_extract_text, resumes)
+
+            if not needs_doc:
+                for resume, text_raw, error in texts:
+                    yield resume, cls.__parse_extracted(resume, text_raw, None, error, fields, experience_backend)
+                return
+
+            chunk_size = batch_size * max(1, n_process)
+            profile = cls.nlp_profile(fields)
+            for chunk in _chunks(texts, chunk_size):
+                by_language = {}
+                for index, (resume, text_raw, error) in enumerate(chunk):
+                    if error is None:
+                        text = ' '.join(text_raw.split())
+                        by_language.setdefault(detect_language(text), []).append((text, index))
+                docs = {}
+                errors = {}
+                for language, contexts in by_language.items():
+                    model = model_for(language)
+                    try:
+                        for doc, index in nlp_registry.pipe(contexts, profile=profile, model=model, as_tuples=True,
+                                                            batch_size=batch_size, n_process=n_process):
+                            docs[index] = doc
+                    except Exception:
+                        # find the text that broke the batch, the others still get their Doc
+                        for text, index in contexts:
+                            if index not in docs:
+                                try:
+                                    docs[index] = nlp_registry.process(text, profile=profile, model=model)
+                                except Exception as e:
+                                    errors[index] = '{}: {}'.format(type(e).__name__, e)
+                for index, (resume, text_raw, error) in enumerate(chunk):
+                    yield resume, cls.__parse_extracted(resume, text_raw, docs.get(index), error or errors.get(index),
+                                                        fields, experience_backend)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    @classmethod
+    def __parse_extracted(cls, resume, text_raw, doc, error, fields, experience_backend):
+        if error is None:
+            try:
+                parser = cls.from_doc(resume, text_raw, doc, fields, experience_backend)
+                result = parse_result(resume, data=parser.get_extracted_data(), parse_metrics=parser.get_metrics())
+            except Exception as e:
+                error = '{}: {}'.format(type(e).__name__, e)
+        if error is not None:
+            result = parse_result(resume, reason='error', error=error)
+        metrics.record_result(result)
+        return result
 
     def get_extracted_data(self):
         return self.__details
 
-    def __get_basic_details(self):
-        name       = utils.extract_name(self.__nlp, matcher=self.__matcher)
-        email      = utils.extract_email(self.__text)
-        mobile     = utils.extract_mobile_number(self.__text)
-        skills     = utils.extract_skills(self.__nlp, self.__noun_chunks)
-        edu        = utils.extract_education_keywords([sent.string.strip() for sent in self.__nlp.sents])
-        experience = utils.extract_experience(self.__text)
-        entities   = utils.extract_entity_sections(self.__text_raw)
-        self.__details['name'] = name
-        self.__details['email'] = email
-        self.__details['mobile_number'] = mobile
-        self.__details['skills'] = skills
+    def get_artifacts(self):
+        '''
+        Raw text and Doc computed while parsing, for `from_doc` to reuse later
+
+        :return: dictionary with `text_raw` and `doc`, None for stages that did not run
+        '''
+        return {
+            'text_raw': self.__stages.get('text_raw'),
+            'doc'     : self.__stages.get('doc'),
+        }
+
+    def get_metrics(self):
+        '''
+        Exclusive wall-clock seconds spent in each stage and field extractor
+        that ran, and the size of the input
+
+        :return: dictionary with `stages`, `fields`, `pages`, `characters`, `tokens`
+                 and the detected `language`
+        '''
+        text_raw = self.__stages.get('text_raw')
+        doc = self.__stages.get('doc')
+        is_pdf = self.__get_extension() == '.pdf'
+        return {
+            'stages'    : dict(self.__timings['stages']),
+            'fields'    : dict(self.__timings['fields']),
+            # pdfminer ends every page with a form feed
+            'pages'     : text_raw.count('\x0c') if is_pdf and text_raw is not None else None,
+            'characters': len(text_raw) if text_raw is not None else None,
+            'tokens'    : len(doc) if doc is not None else None,
+            'language'  : self.__stages.get('language'),
+        }
+
+    def __stage(self, name):
+        if name not in self.__stages:
+            # build the inputs first so the timing only covers this stage
+            for dependency in self.STAGES[name]:
+                self.__stage(dependency)
+            start = time.perf_counter()
+            self.__stages[name] = self.__STAGE_BUILDERS[name](self)
+            self.__timings['stages'][name] = time.perf_counter() - start
+        return self.__stages[name]
+
+    def __get_extension(self):
+        if self.__extension is None:
+            self.__extension = utils.guess_extension(self.__resume)
+        return self.__extension
+
+    def __build_text_raw(self):
+        return utils.extract_text(self.__resume, self.__get_extension(),
+                                  page_workers=self.__page_workers, page_threshold=self.__page_threshold)
+
+    def __build_text(self):
+        return ' '.join(self.__stage('text_raw').split())
+
+    def __build_language(self):
+        return detect_language(self.__stage('text'))
+
+    def __build_doc(self):
+        return nlp_registry.process(self.__stage('text'), profile=self.__profile,
+                                    model=model_for(self.__stage('language')))
+
+    def __build_sections(self):
+        return utils.find_sections(self.__stage('text_raw'))
+
+    __STAGE_BUILDERS = {
+        'text_raw': __build_text_raw,
+        'text'    : __build_text,
+        'language': __build_language,
+        'doc'     : __build_doc,
+        'sections': __build_sections,
+    }
+
+    def __extract_name(self):
+        doc = self.__stage('doc')
+        return utils.extract_name(doc, matcher=nlp_registry.get_matcher(model_for(doc.lang_)))
+
+    def __extract_email(self):
+        return utils.extract_email(self.__stage('text'))
+
+    def __extract_mobile_number(self):
+        return utils.extract_mobile_number(self.__stage('text'))
+
+    def __extract_skills(self):
+        doc = self.__stage('doc')
+        return utils.extract_skills(doc, list(doc.noun_chunks))
+
+    def __extract_education(self):
         # self.__details['education'] = entities['education']
-        self.__details['education'] = edu
-        self.__details['experience'] = experience
+        return utils.extract_education_keywords([sent.string.strip() for sent in self.__stage('doc').sents])
+
+    def __extract_experience(self):
+        if self.__experience_backend == 'nltk':
+            return utils.extract_experience(self.__stage('text'), language=self.__stage('language'))
+        return utils.extract_experience_from_doc(self.__stage('doc'))
+
+    def __extract_competencies(self):
+        try:
+            experience = utils.section_lines(self.__stage('text_raw'), self.__stage('sections')['experience'])
+            return utils.extract_competencies(self.__stage('text_raw'), experience, language=self.__stage('language'))
+        except KeyError:
+            return []
+
+    def __extract_measurable_results(self):
         try:
-            self.__details['competencies'] = utils.extract_competencies(self.__text_raw, entities['experience'])
-            self.__details['measurable_results'] = utils.extract_measurable_results(self.__text_raw, entities['experience'])
+            experience = utils.section_lines(self.__stage('text_raw'), self.__stage('sections')['experience'])
+            return utils.extract_measurable_results(self.__stage('text_raw'), experience,
+                                                    language=self.__stage('language'))
         except KeyError:
-            self.__details['competencies'] = []
-            self.__details['measurable_results'] = []
+            return []
+
+    __FIELD_EXTRACTORS = {
+        'name'              : __extract_name,
+        'email'             : __extract_email,
+        'mobile_number'     : __extract_mobile_number,
+        'skills'            : __extract_skills,
+        'education'         : __extract_education,
+        'experience'        : __extract_experience,
+        'competencies'      : __extract_competencies,
+        'measurable_results': __extract_measurable_results,
+    }
+
+    def __get_basic_details(self):
+        for field in self.__fields:
+            for stage in self.__field_stages(field, self.__experience_backend):
+                self.__stage(stage)
+            start = time.perf_counter()
+            self.__details[field] = self.__FIELD_EXTRACTORS[field](self)
+            self.__timings['fields'][field] = time.perf_counter() - start
         return
 
-def resume_result_wrapper(resume):
-        parser = ResumeParser(resume)
-        return parser.get_extracted_data()
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
-if __name__ == '__main__':
-    pool = mp.Pool(mp.cpu_count())
+def parse_result(resume, data=None, reason=None, error=None, started=None, parse_metrics=None, artifacts=None):
+    '''
+    Outcome of parsing one resume, as returned by `sandbox.guarded_parse` and `ResumeParser.parse_many`
+
+    :return: dictionary with `resume`, `ok`, `data`, `reason` ('timeout', 'memory' or 'error'),
+             `error`, `elapsed`, `metrics` and `artifacts`
+    '''
+    return {
+        # the path or file name, never the content of in-memory resumes
+        'resume': resume if isinstance(resume, str) else getattr(resume, 'name', None),
+        'ok': reason is None,
+        'data': data,
+        'reason': reason,
+        'error': error,
+        'elapsed': time.perf_counter() - started if started else None,
+        'metrics': parse_metrics,
+        'artifacts': artifacts,
+    }
 
+def _extract_text(resume):
+    try:
+        return resume, utils.extract_text(resume), None
+    except Exception as e:
+        return resume, None, '{}: {}'.format(type(e).__name__, e)
+
+if __name__ == '__main__':
     resumes = []
-    data = []
     for root, directories, filenames in os.walk('resumes'):
         for filename in filenames:
             file = os.path.join(root, filename)
             resumes.append(file)
 
-    results = [pool.apply_async(resume_result_wrapper, args=(x,)) for x in resumes]
-
-    results = [p.get() for p in results]
+    results = [result['data'] if result['ok'] else result
+               for resume, result in ResumeParser.parse_many(resumes,
+                                                             n_process=mp.cpu_count(),
+                                                             extract_workers=mp.cpu_count())]
 
-    pprint.pprint(results)
\ No newline at end of file
+    pprint.pprint(results)
@@ -0,0 +1,262 @@
+import multiprocessing as mp
+import queue
+import resource
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+from . import metrics
+from . import nlp_registry
+from . import utils
+from .language import model_for
+from .resume_parser import ResumeParser, parse_result
+
+DEFAULT_TIMEOUT = 60
+DEFAULT_MEMORY_LIMIT_MB = 2048
+DEFAULT_MAX_TASKS_PER_CHILD = 50
+
+# how long past the timeout the supervisor waits before killing a child that
+# is stuck somewhere the alarm can't interrupt (e.g. inside a C extension)
+KILL_GRACE_SECONDS = 5
+
+
+class ParseTimeout(Exception):
+    pass
+
+
+class ParseError(Exception):
+    '''
+    Raised by callers that want an exception instead of a failure result
+    '''
+
+    def __init__(self, result):
+        super().__init__(result['error'])
+        self.result = result
+
+
+def limit_memory(memory_limit_mb):
+    '''
+    Cap the address space of the current process, allocations beyond it raise `MemoryError`
+
+    :param memory_limit_mb: limit in MB, falsy for no limit
+    '''
+    if not memory_limit_mb:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+@contextmanager
+def time_limit(seconds):
+    '''
+    Raise `ParseTimeout` in the current process after `seconds`. Relies on
+    SIGALRM, so it is a no-op outside the main thread.
+    '''
+    if not seconds or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise ParseTimeout('parsing took longer than {}s'.format(seconds))
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _serialize_artifacts(parser):
+    artifacts = parser.get_artifacts()
+    if artifacts['text_raw'] is None or artifacts['doc'] is None:
+        return None
+    return {
+        'text_raw': artifacts['text_raw'],
+        'doc': nlp_registry.doc_to_bytes(artifacts['doc']),
+        'model': nlp_registry.model_version(model_for(artifacts['doc'].lang_)),
+    }
+
+
+def guarded_parse(resume, fields=None, timeout=DEFAULT_TIMEOUT, keep_artifacts=False, extension=None):
+    '''
+    Parse a resume in the current process and turn timeouts, memory
+    exhaustion and parser errors into a failure result instead of raising
+
+    :param resume: path of the resume, or its content as bytes or a binary file-like object
+    :param keep_artifacts: also return the raw text and the serialized Doc
+    :param extension: see `ResumeParser`
+    :return: dictionary with `ok`, `data`, `reason` ('timeout', 'memory' or 'error'), `error`,
+             `elapsed`, `metrics` (see `ResumeParser.get_metrics`) and `artifacts`
+             (`text_raw`, `doc` bytes and `model`, or None)
+    '''
+    started = time.perf_counter()
+    try:
+        with time_limit(timeout):
+            parser = ResumeParser(resume, fields=fields, extension=extension)
+            data = parser.get_extracted_data()
+            artifacts = _serialize_artifacts(parser) if keep_artifacts else None
+    except ParseTimeout as e:
+        return parse_result(resume, reason='timeout', error=str(e), started=started)
+    except MemoryError:
+        return parse_result(resume, reason='memory', error='memory limit exceeded', started=started)
+    except Exception as e:
+        return parse_result(resume, reason='error', error='{}: {}'.format(type(e).__name__, e), started=started)
+    return parse_result(resume, data=data, started=started, parse_metrics=parser.get_metrics(),
+                   artifacts=artifacts)
+
+
+def init_child(memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB):
+    '''
+    Pool initializer: apply the memory limit and make sure the models are
+    loaded (a no-op when they were already loaded before the fork)
+    '''
+    # the supervisor handles Ctrl+C, children just get terminated
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    nlp_registry.warm_up()
+    limit_memory(memory_limit_mb)
+
+
+class SandboxedParser(object):
+    '''
+    Runs `ResumeParser` in a supervised child process with a wall-clock
+    timeout and an address-space limit. Children are recycled every
+    `max_tasks_per_child` parses, and a child that can't be interrupted in
+    time is killed and replaced, so callers always get a result back.
+    '''
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                 max_tasks_per_child=DEFAULT_MAX_TASKS_PER_CHILD):
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_child = max_tasks_per_child
+        self.__pool = None
+        self.__lock = threading.Lock()
+
+    def __get_pool(self):
+        if self.__pool is None:
+            self.__pool = mp.Pool(1, initializer=init_child, initargs=(self.memory_limit_mb,),
+                                  maxtasksperchild=self.max_tasks_per_child or None)
+        return self.__pool
+
+    def start(self):
+        '''
+        Fork the child now instead of on the first parse, e.g. right after loading
+        the models and closing database connections
+        '''
+        with self.__lock:
+            self.__get_pool()
+
+    def parse(self, resume, fields=None, keep_artifacts=False, extension=None):
+        '''
+        :param resume: path of the resume to parse, or its content as bytes or a binary
+                       file-like object (e.g. a Django `UploadedFile`). In-memory files are read
+                       here and their bytes handed to the child.
+        :param fields: iterable of `ResumeParser.FIELDS` names, None for all
+        :param keep_artifacts: see `guarded_parse`
+        :param extension: see `ResumeParser`
+        :return: result dictionary, see `guarded_parse`
+        '''
+        name = utils.resume_name(resume)
+        if hasattr(resume, 'temporary_file_path'):
+            # large uploads are already spooled to disk, the child reads them there
+            extension = extension or utils.guess_extension(resume)
+            resume = resume.temporary_file_path()
+        elif not isinstance(resume, (str, bytes)):
+            extension = extension or utils.guess_extension(resume)
+            with utils.open_resume(resume) as fh:
+                resume = fh.read()
+        result = self.__parse(resume, fields, keep_artifacts, extension)
+        result['resume'] = name
+        metrics.record_result(result)
+        return result
+
+    def __parse(self, resume, fields, keep_artifacts, extension):
+        started = time.perf_counter()
+        with self.__lock:
+            pending = self.__get_pool().apply_async(guarded_parse, (resume, fields, self.timeout, keep_artifacts, extension))
+            try:
+                return pending.get(self.timeout + KILL_GRACE_SECONDS if self.timeout else None)
+            except mp.TimeoutError:
+                # the child is stuck or died (e.g. OOM killer), replace it
+                self.close()
+                return parse_result(resume, reason='timeout',
+                               error='parser process killed after {}s'.format(self.timeout), started=started)
+            except Exception as e:
+                self.close()
+                return parse_result(resume, reason='error', error='{}: {}'.format(type(e).__name__, e), started=started)
+
+    def close(self):
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool.join()
+            self.__pool = None
+
+
+class SandboxedPool(object):
+    '''
+    `workers` `SandboxedParser` children fed from one iterable of resumes, for
+    bulk runs. Every file gets the same time budget and kill-and-replace
+    supervision as a single `SandboxedParser`, so a child that crashes or
+    hangs costs one failed result instead of blocking the whole run.
+    '''
+
+    def __init__(self, workers, timeout=DEFAULT_TIMEOUT, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                 max_tasks_per_child=DEFAULT_MAX_TASKS_PER_CHILD):
+        self.__parsers = [SandboxedParser(timeout, memory_limit_mb, max_tasks_per_child)
+                          for _ in range(max(1, workers))]
+
+    def start(self):
+        for parser in self.__parsers:
+            parser.start()
+
+    def imap_unordered(self, resumes, fields=None, keep_artifacts=False):
+        '''
+        Parse `resumes` (consumed lazily) and yield their result dictionaries,
+        see `guarded_parse`, in completion order
+        '''
+        resumes = iter(resumes)
+        lock = threading.Lock()
+        results = queue.Queue()
+
+        def feed(parser):
+            # one thread per parser, each waiting on its own child
+            try:
+                while True:
+                    with lock:
+                        resume = next(resumes, None)
+                    if resume is None:
+                        break
+                    results.put(parser.parse(resume, fields=fields, keep_artifacts=keep_artifacts))
+            except Exception as e:
+                results.put(e)
+            finally:
+                results.put(None)
+
+        threads = [threading.Thread(target=feed, args=(parser,), daemon=True) for parser in self.__parsers]
+        for thread in threads:
+            thread.start()
+        running = len(threads)
+        while running:
+            result = results.get()
+            if result is None:
+                running -= 1
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                yield result
+
+    def close(self):
+        for parser in self.__parsers:
+            parser.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -205,6 +205,21 @@ CORS_ALLOW_CREDENTIALS = True
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 
+# Parse result cache (see parser_app/parse_cache.py)
+PARSE_CACHE_MAX_AGE_DAYS = int(os.environ.get('PARSE_CACHE_MAX_AGE_DAYS', 90))
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get('PARSE_CACHE_MAX_ENTRIES', 50000))
+
+# Parsing runs in a supervised child process (see resume_parser/sandbox.py)
+PARSE_TIMEOUT_SECONDS = int(os.environ.get('PARSE_TIMEOUT_SECONDS', 60))
+PARSE_MEMORY_LIMIT_MB = int(os.environ.get('PARSE_MEMORY_LIMIT_MB', 2048))
+PARSE_MAX_TASKS_PER_CHILD = int(os.environ.get('PARSE_MAX_TASKS_PER_CHILD', 50))
+
+# Jobs left RUNNING by a worker that died are requeued at most this many times, then marked failed
+PARSE_MAX_ATTEMPTS = int(os.environ.get('PARSE_MAX_ATTEMPTS', 3))
+
+# Parse workers dump their timing histograms here for /api/v1/admin/metrics/ to merge
+PARSE_METRICS_DIR = os.environ.get('PARSE_METRICS_DIR', os.path.join(BASE_DIR, 'metrics'))
+
 
 # Email configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
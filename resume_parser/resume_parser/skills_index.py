@@ -0,0 +1,111 @@
+import csv
+import json
+import os
+import sys
+import threading
+
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
+
+SKILLS_CSV = os.path.join(os.path.dirname(__file__), 'skills.csv')
+# optional precompiled artifact, built with `python -m resume_parser.skills_index`
+SKILLS_INDEX = os.environ.get(
+    'RESUME_PARSER_SKILLS_INDEX',
+    os.path.join(os.path.dirname(__file__), 'skills.index.json')
+)
+
+_index = None
+_lock = threading.Lock()
+
+
+class SkillsIndex(object):
+    '''
+    Lowercased skills gazetteer: a set for O(1) unigram / noun chunk lookups
+    and a `PhraseMatcher` (built lazily per vocab) for multi-word skills
+    '''
+
+    def __init__(self, skills):
+        self.skills = frozenset(skill.strip().lower() for skill in skills if skill.strip())
+        self.unigrams = frozenset(skill for skill in self.skills if ' ' not in skill)
+        self.phrases = sorted(skill for skill in self.skills if ' ' in skill)
+        self.__phrase_matchers = {}
+        self.__lock = threading.Lock()
+
+    def __contains__(self, text):
+        return text in self.skills
+
+    def phrase_matcher(self, vocab, make_doc=None):
+        '''
+        Return a `PhraseMatcher` for the multi-word skills, bound to `vocab`
+
+        :param vocab: object of `spacy.vocab.Vocab`
+        :param make_doc: tokenizer used to build the patterns, falls back to
+                         splitting on whitespace when not given
+        :return: object of `spacy.matcher.PhraseMatcher`
+        '''
+        key = id(vocab)
+        matcher = self.__phrase_matchers.get(key)
+        if matcher is None:
+            with self.__lock:
+                matcher = self.__phrase_matchers.get(key)
+                if matcher is None:
+                    if make_doc is None:
+                        patterns = [Doc(vocab, words=phrase.split()) for phrase in self.phrases]
+                    else:
+                        patterns = [make_doc(phrase) for phrase in self.phrases]
+                    matcher = PhraseMatcher(vocab, attr='LOWER')
+                    matcher.add('SKILL', None, *patterns)
+                    self.__phrase_matchers[key] = matcher
+        return matcher
+
+    @classmethod
+    def from_csv(cls, path=SKILLS_CSV):
+        # the skills are stored as the header row of the CSV
+        with open(path, newline='', encoding='utf-8') as fh:
+            header = next(csv.reader(fh), [])
+        return cls(header)
+
+    @classmethod
+    def from_artifact(cls, path=SKILLS_INDEX):
+        with open(path, encoding='utf-8') as fh:
+            return cls(json.load(fh)['skills'])
+
+    def dump(self, path=SKILLS_INDEX):
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump({'skills': sorted(self.skills)}, fh, ensure_ascii=False)
+
+
+def load_skills_index(csv_path=SKILLS_CSV, artifact_path=SKILLS_INDEX):
+    '''
+    Load the skills index from the precompiled artifact when it is up to date
+    with the CSV, otherwise from the CSV itself
+
+    :return: object of `SkillsIndex`
+    '''
+    if os.path.exists(artifact_path) and (
+            not os.path.exists(csv_path) or
+            os.path.getmtime(artifact_path) >= os.path.getmtime(csv_path)):
+        return SkillsIndex.from_artifact(artifact_path)
+    return SkillsIndex.from_csv(csv_path)
+
+
+def get_skills_index():
+    '''
+    Return the process-wide skills index, loading it on first use
+
+    :return: object of `SkillsIndex`
+    '''
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = load_skills_index()
+    return _index
+
+
+if __name__ == '__main__':
+    # python -m resume_parser.skills_index [output_path]
+    output = sys.argv[1] if len(sys.argv) > 1 else SKILLS_INDEX
+    index = SkillsIndex.from_csv()
+    index.dump(output)
+    print('Wrote {} skills ({} multi-word) to {}'.format(len(index.skills), len(index.phrases), output))
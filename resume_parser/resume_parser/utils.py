@@ -1,11 +1,13 @@
 import io
 import os
 import re
+import unicodedata
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from xml.etree.ElementTree import iterparse
 
-import docx2txt
 import nltk
-import pandas as pd
-from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
@@ -14,104 +16,356 @@ from pdfminer.pdfinterp import PDFResourceManager
 from pdfminer.pdfpage import PDFPage
 
 from . import constants as cs
+from .language import stopwords as get_stopwords
+from .skills_index import get_skills_index
 from .constants import *
 
 
-def extract_text_from_pdf(pdf_path):
+@contextmanager
+def open_resume(resume):
     '''
-    Helper function to extract the plain text from .pdf files
+    Open a resume given as a path, bytes or a binary file-like object (e.g. a
+    Django `UploadedFile`) for reading from the start. File objects are
+    rewound but left open, and uploads spooled to disk are read from their
+    temporary file.
 
-    :param pdf_path: path to PDF file to be extracted
+    :return: context manager yielding a seekable binary file object
+    '''
+    if hasattr(resume, 'temporary_file_path'):
+        resume = resume.temporary_file_path()
+    if isinstance(resume, str):
+        with open(resume, 'rb') as fh:
+            yield fh
+    elif isinstance(resume, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(resume)
+    else:
+        resume.seek(0)
+        yield resume
+
+def resume_name(resume):
+    '''
+    :return: path or file name of a resume given as a path or a file object, None for bytes
+    '''
+    if isinstance(resume, str):
+        return resume
+    return getattr(resume, 'name', None)
+
+def guess_extension(resume):
+    '''
+    Helper function to find the extension of a resume from its name or, for
+    bytes and unnamed file objects, from its first bytes
+
+    :param resume: path, bytes or binary file-like object
+    :return: '.pdf', '.docx', '.doc' or the extension of the name ('' if unknown)
+    '''
+    name = resume_name(resume)
+    if name:
+        return os.path.splitext(name)[1].lower()
+    with open_resume(resume) as fh:
+        head = fh.read(len(_OLE2_MAGIC))
+    if head.startswith(b'%PDF'):
+        return '.pdf'
+    if head.startswith(b'PK'):
+        return '.docx'
+    if head.startswith(_OLE2_MAGIC):
+        return '.doc'
+    return ''
+
+def extract_text_from_pdf(pdf_path, max_pages=None, max_chars=None, pagenos=None):
+    '''
+    Helper function to extract the plain text from .pdf files, one page at a time.
+    A single resource manager, converter and output buffer are reused for the
+    whole document and extraction stops as soon as either budget is reached.
+
+    :param pdf_path: path, bytes or binary file object of the PDF file to be extracted
+    :param max_pages: maximum number of pages to interpret, None for all
+    :param max_chars: stop after this many characters have been yielded, None for no limit
+    :param pagenos: optional set of zero-based page numbers to restrict extraction to
     :return: iterator of string of extracted text
     '''
     # https://www.blog.pythonlibrary.org/2018/05/03/exporting-data-from-pdfs-with-python/
-    with open(pdf_path, 'rb') as fh:
-        for page in PDFPage.get_pages(fh, 
-                                      caching=True,
-                                      check_extractable=True):
-            resource_manager = PDFResourceManager()
-            fake_file_handle = io.StringIO()
-            converter = TextConverter(resource_manager, fake_file_handle, codec='utf-8', laparams=LAParams())
-            page_interpreter = PDFPageInterpreter(resource_manager, converter)
-            page_interpreter.process_page(page)
- 
-            text = fake_file_handle.getvalue()
-            yield text
- 
+    with open_resume(pdf_path) as fh:
+        resource_manager = PDFResourceManager(caching=True)
+        output = io.StringIO()
+        converter = TextConverter(resource_manager, output, codec='utf-8', laparams=LAParams())
+        page_interpreter = PDFPageInterpreter(resource_manager, converter)
+        extracted = 0
+        try:
+            for page in PDFPage.get_pages(fh,
+                                          pagenos=pagenos,
+                                          maxpages=max_pages or 0,
+                                          caching=True,
+                                          check_extractable=True):
+                page_interpreter.process_page(page)
+
+                # hand out this page's text and reset the buffer for the next one
+                text = output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+                yield text
+
+                extracted += len(text)
+                if max_chars and extracted >= max_chars:
+                    break
+        finally:
             # close open handles
             converter.close()
-            fake_file_handle.close()
+            output.close()
 
-def extract_text_from_doc(doc_path):
+def count_pdf_pages(pdf_path):
     '''
-    Helper function to extract plain text from .doc or .docx files
+    Helper function to count the pages of a .pdf file without interpreting them
 
-    :param doc_path: path to .doc or .docx file to be extracted
-    :return: string of extracted text
+    :param pdf_path: path, bytes or binary file object of the PDF file
+    :return: number of pages
     '''
-    temp = docx2txt.process(doc_path)
-    text = [line.replace('\t', ' ') for line in temp.split('\n') if line]
-    return ' '.join(text)
+    with open_resume(pdf_path) as fh:
+        return sum(1 for _ in PDFPage.get_pages(fh, caching=True))
+
+def _extract_pdf_page_range(args):
+    pdf_path, first, last, max_chars = args
+    return list(extract_text_from_pdf(pdf_path, pagenos=set(range(first, last)), max_chars=max_chars))
 
-def extract_text(file_path, extension):
+def extract_text_from_pdf_parallel(pdf_path, workers, min_pages=cs.PDF_PARALLEL_MIN_PAGES, max_pages=None, max_chars=None):
+    '''
+    Helper function to extract the plain text from large .pdf files on several
+    cores. Each worker interprets a contiguous range of pages and the text is
+    reassembled in page order. Documents shorter than `min_pages` are
+    extracted in-process.
+
+    Must not be called from a daemonic process (e.g. a `multiprocessing.Pool` worker).
+
+    :param pdf_path: path to PDF file to be extracted
+    :param workers: number of worker processes
+    :param min_pages: page count from which the work is spread across processes
+    :param max_pages: maximum number of pages to extract, None for all
+    :param max_chars: maximum number of characters to return, None for no limit. Each
+                      worker also stops interpreting its range once it has this many.
+    :return: list of string of extracted text, one per page
+    '''
+    pages = count_pdf_pages(pdf_path)
+    if max_pages:
+        pages = min(pages, max_pages)
+    if workers < 2 or pages < max(min_pages, 2):
+        return list(extract_text_from_pdf(pdf_path, max_pages=max_pages, max_chars=max_chars))
+
+    workers = min(workers, pages)
+    step = -(-pages // workers)
+    ranges = [(pdf_path, first, min(first + step, pages), max_chars) for first in range(0, pages, step)]
+    texts = []
+    extracted = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() keeps the input order, so pages come back in document order
+        for chunk in executor.map(_extract_pdf_page_range, ranges):
+            for text in chunk:
+                if max_chars:
+                    if extracted >= max_chars:
+                        return texts
+                    text = text[:max_chars - extracted]
+                texts.append(text)
+                extracted += len(text)
+    return texts
+
+# WordprocessingML elements read by `extract_text_from_docx`
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_DOCX_TEXT, _DOCX_TAB, _DOCX_BREAKS, _DOCX_PARAGRAPH = _W + 't', _W + 'tab', (_W + 'br', _W + 'cr'), _W + 'p'
+# <w:tab> also declares tab stops inside <w:tabs>, those are not text
+_DOCX_TAB_STOPS = _W + 'tabs'
+
+# first bytes of legacy (OLE2) Word documents and of RTF files saved as .doc
+_OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_RTF_MAGIC = b'{\\rtf'
+
+
+class UnsupportedDocument(ValueError):
+    pass
+
+
+def extract_text_from_docx(docx_path, max_chars=None):
+    '''
+    Helper function to extract the plain text from .docx files. `word/document.xml`
+    is streamed out of the archive with an incremental parser and every
+    paragraph is dropped once read, so memory stays bounded whatever the
+    document size. Headers, footers and images are not read.
+
+    :param docx_path: path or binary file object of the .docx file
+    :param max_chars: stop after this many characters have been yielded, None for no limit
+    :return: iterator of string of extracted text, one per non-empty line
+    '''
+    extracted = 0
+    with zipfile.ZipFile(docx_path) as archive, archive.open('word/document.xml') as xml:
+        line = []
+        parents = []
+        for event, element in iterparse(xml, events=('start', 'end')):
+            if event == 'start':
+                parents.append(element)
+                continue
+            parents.pop()
+            tag = element.tag
+            if tag == _DOCX_TEXT:
+                line.append(element.text or '')
+            elif tag == _DOCX_TAB and parents[-1].tag != _DOCX_TAB_STOPS:
+                line.append(' ')
+            elif tag in _DOCX_BREAKS or tag == _DOCX_PARAGRAPH:
+                text = ''.join(line)
+                line = []
+                if text:
+                    yield text
+                    extracted += len(text)
+                    if max_chars and extracted >= max_chars:
+                        return
+                if tag == _DOCX_PARAGRAPH and parents:
+                    parents[-1].remove(element)
+
+def extract_text_from_doc(doc_path, max_chars=None):
+    '''
+    Helper function to extract plain text from .doc or .docx files. A .doc
+    file is read as long as it is a renamed .docx, legacy binary Word and RTF
+    documents are rejected.
+
+    :param doc_path: path, bytes or binary file object of the .doc or .docx file to be extracted
+    :param max_chars: maximum number of characters to extract, None for no limit
+    :return: string of extracted text
+    :raises UnsupportedDocument: if the file is not an Office Open XML document
+    '''
+    label = os.path.basename(resume_name(doc_path) or 'document')
+    with open_resume(doc_path) as fh:
+        if not zipfile.is_zipfile(fh):
+            fh.seek(0)
+            head = fh.read(len(_OLE2_MAGIC))
+            if head.startswith(_OLE2_MAGIC):
+                kind = 'legacy binary Word (.doc) documents are not supported, save it as .docx or .pdf'
+            elif head.startswith(_RTF_MAGIC):
+                kind = 'RTF documents are not supported, save it as .docx or .pdf'
+            else:
+                kind = 'not a Word document'
+            raise UnsupportedDocument('{}: {}'.format(label, kind))
+        try:
+            # one paragraph per line, like the PDF text, so section headers can be found
+            return '\n'.join(extract_text_from_docx(fh, max_chars=max_chars))
+        except KeyError:
+            # a zip without word/document.xml (e.g. an .odt renamed to .doc)
+            raise UnsupportedDocument('{}: not a Word document'.format(label))
+
+def extract_text(file_path, extension=None, max_pages=cs.PDF_MAX_PAGES, max_chars=cs.TEXT_MAX_CHARS,
+                 page_workers=None, page_threshold=cs.PDF_PARALLEL_MIN_PAGES):
     '''
     Wrapper function to detect the file extension and call text extraction function accordingly
 
-    :param file_path: path of file of which text is to be extracted
-    :param extension: extension of file `file_name`
+    :param file_path: path of file of which text is to be extracted, or its content as
+                      bytes or a binary file-like object (e.g. a Django `UploadedFile`)
+    :param extension: extension of file `file_name`, guessed with `guess_extension` when None
+    :param max_pages: maximum number of PDF pages to extract, None for all
+    :param max_chars: maximum number of characters to return, None for no limit
+    :param page_workers: spread the pages of large PDFs across this many processes, None to stay in-process.
+                         Only used for paths, the workers open the file themselves.
+    :param page_threshold: minimum page count for `page_workers` to be used
     '''
+    if extension is None:
+        extension = guess_extension(file_path)
     text = ''
     if extension == '.pdf':
-        for page in extract_text_from_pdf(file_path):
-            text += ' ' + page
+        if page_workers and isinstance(file_path, str):
+            pages = extract_text_from_pdf_parallel(file_path, page_workers, min_pages=page_threshold,
+                                                   max_pages=max_pages, max_chars=max_chars)
+        else:
+            pages = extract_text_from_pdf(file_path, max_pages=max_pages, max_chars=max_chars)
+        text = ' '.join(pages)
     elif extension == '.docx' or extension == '.doc':
-        text = extract_text_from_doc(file_path)
+        text = extract_text_from_doc(file_path, max_chars=max_chars)
+    if max_chars:
+        text = text[:max_chars]
     return text
 
+def _fold_table():
+    # lowercase and strip accents one character for one character, so offsets
+    # in the folded text are offsets in the original
+    table = {}
+    for code in range(0x41, 0x250):
+        lower = chr(code).lower()
+        if len(lower) != 1:
+            continue
+        base = unicodedata.normalize('NFD', lower)[0]
+        if base != chr(code):
+            table[code] = base
+    table.update({ord(quote): "'" for quote in '\u2019\u2018\u02bc`'})
+    return table
+
+_FOLD = _fold_table()
+
+def fold(text):
+    '''
+    Lowercase `text` and strip its accents without changing its length
+    '''
+    return text.translate(_FOLD)
+
+class SectionLexer(object):
+    '''
+    Section headers (`{section: [header, ...]}`) compiled to a single regex
+    that finds every header line of a resume in one scan. A header line holds
+    one of the headers, possibly multi-word, and nothing else but punctuation,
+    or is followed by ':' and the first line of the section. Matching ignores
+    case, accents and the kind of apostrophe.
+    '''
+
+    def __init__(self, sections):
+        self.__sections = {}
+        for section, headers in sections.items():
+            for header in headers:
+                self.__sections[fold(header)] = section
+        # longest first, so 'expérience professionnelle' wins over 'expérience'
+        headers = sorted(self.__sections, key=len, reverse=True)
+        alternatives = '|'.join(r'[ \t]+'.join(re.escape(word) for word in header.split()) for header in headers)
+        self.__pattern = re.compile(r'^[^\w\n]*(?P<header>' + alternatives + r')[^\w\n:]*(?::|$)', re.MULTILINE)
+
+    def find(self, text):
+        '''
+        :param text: raw resume text
+        :return: dictionary of section -> list of (start, end) offsets of its
+                 body in `text`, one per header found, in document order
+        '''
+        headers = [(self.__sections[' '.join(match.group('header').split())], match.start(), match.end())
+                   for match in self.__pattern.finditer(fold(text))]
+        sections = {}
+        for index, (section, start, body_start) in enumerate(headers):
+            end = headers[index + 1][1] if index + 1 < len(headers) else len(text)
+            sections.setdefault(section, []).append((body_start, end))
+        return sections
+
+
+SECTION_LEXER = SectionLexer(cs.RESUME_SECTIONS)
+
+
+def find_sections(text):
+    '''
+    Helper function to locate the sections of a resume
+
+    :param text: Raw text of resume
+    :return: dictionary of section (key of `constants.RESUME_SECTIONS`) -> list of (start, end) offsets
+    '''
+    return SECTION_LEXER.find(text)
+
+def section_lines(text, spans):
+    '''
+    Helper function to read the non-empty lines of a section found by `find_sections`
+
+    :param text: Raw text of resume
+    :param spans: list of (start, end) offsets of the section
+    :return: list of stripped lines
+    '''
+    lines = []
+    for start, end in spans:
+        lines.extend(line.strip() for line in text[start:end].split('\n') if line.strip())
+    return lines
+
 def extract_entity_sections(text):
     '''
     Helper function to extract all the raw text from sections of resume
 
     :param text: Raw text of resume
-    :return: dictionary of entities
-    '''
-    text_split = [i.strip() for i in text.split('\n')]
-    # sections_in_resume = [i for i in text_split if i.lower() in sections]
-    entities = {}
-    key = False
-    for phrase in text_split:
-        if len(phrase) == 1:
-            p_key = phrase
-        else:
-            p_key = set(phrase.lower().split()) & set(cs.RESUME_SECTIONS)
-        try:
-            p_key = list(p_key)[0]
-        except IndexError:
-            pass
-        if p_key in cs.RESUME_SECTIONS:
-            entities[p_key] = []
-            key = p_key
-        elif key and phrase.strip():
-            entities[key].append(phrase)
-    
-    # entity_key = False
-    # for entity in entities.keys():
-    #     sub_entities = {}
-    #     for entry in entities[entity]:
-    #         if u'\u2022' not in entry:
-    #             sub_entities[entry] = []
-    #             entity_key = entry
-    #         elif entity_key:
-    #             sub_entities[entity_key].append(entry)
-    #     entities[entity] = sub_entities
-
-    # pprint.pprint(entities)
-
-    # make entities that are not found None
-    # for entity in cs.RESUME_SECTIONS:
-    #     if entity not in entities.keys():
-    #         entities[entity] = None 
-    return entities
+    :return: dictionary of section -> list of lines
+    '''
+    return {section: section_lines(text, spans) for section, spans in find_sections(text).items()}
 
 def extract_email(text):
     '''
@@ -134,10 +388,12 @@ def extract_name(nlp_text, matcher):
     :param matcher: object of `spacy.matcher.Matcher`
     :return: string of full name
     '''
-    pattern = [cs.NAME_PATTERN]
-    
-    matcher.add('NAME', None, *pattern)
-    
+    # the shared matcher from `nlp_registry` already carries the pattern,
+    # only register it for a fresh matcher
+    if 'NAME' not in matcher:
+        pattern = [cs.NAME_PATTERN]
+        matcher.add('NAME', None, *pattern)
+
     matches = matcher(nlp_text)
     
     for match_id, start, end in matches:
@@ -186,27 +442,32 @@ def extract_mobile_number(text):
 
     return number
 
-def extract_skills(nlp_text, noun_chunks):
+def extract_skills(nlp_text, noun_chunks, skills_index=None):
     '''
     Helper function to extract skills from spacy nlp text
 
     :param nlp_text: object of `spacy.tokens.doc.Doc`
     :param noun_chunks: noun chunks extracted from nlp text
+    :param skills_index: object of `SkillsIndex`, defaults to the process-wide index
     :return: list of skills extracted
     '''
-    tokens = [token.text for token in nlp_text if not token.is_stop]
-    data = pd.read_csv(os.path.join(os.path.dirname(__file__), 'skills.csv')) 
-    skills = list(data.columns.values)
+    if skills_index is None:
+        skills_index = get_skills_index()
     skillset = []
     # check for one-grams
-    for token in tokens:
-        if token.lower() in skills:
-            skillset.append(token)
-    
+    for token in nlp_text:
+        if not token.is_stop and token.lower_ in skills_index.unigrams:
+            skillset.append(token.text)
+
+    # check for multi-word skills anywhere in the text
+    phrase_matcher = skills_index.phrase_matcher(nlp_text.vocab)
+    for match_id, start, end in phrase_matcher(nlp_text):
+        skillset.append(nlp_text[start:end].text)
+
     # check for bi-grams and tri-grams
     for token in noun_chunks:
         token = token.text.lower().strip()
-        if token in skills:
+        if token in skills_index:
             skillset.append(token)
     return [i.capitalize() for i in set([i.lower() for i in skillset])]
 
@@ -253,15 +514,49 @@ def extract_education_keywords(nlp_text):
     return edu_keywords
 
 
-def extract_experience(resume_text):
+_experience_stopwords = None
+
+def experience_stopwords(language=None):
+    '''
+    NLTK stopwords used by the experience extractors, read once per process
+
+    :param language: key of `constants.LANGUAGE_STOPWORDS`, None for the
+                     stopwords of every supported language
     '''
-    Helper function to extract experience from resume text
+    global _experience_stopwords
+    if language is not None:
+        return get_stopwords(language)
+    if _experience_stopwords is None:
+        _experience_stopwords = frozenset().union(*(get_stopwords(language) for language in cs.LANGUAGE_STOPWORDS))
+    return _experience_stopwords
+
+def _experience_from_chunks(chunks):
+    # Search the words ['expérience', 'professionnelle', 'stage', 'stagiaire', 'internship', 'intern', 'experience', 'professional experience'] in the chunk and then print out the text after it
+
+    experience_keywords = ['expérience', 'professionnelle', 'stage', 'stagiaire', 'internship', 'intern', 'experience', 'professional experience']
+    x = []
+    for i in chunks:
+        if any(word in i.lower() for word in experience_keywords):
+            x.append(i)
+
+    # Search the word 'experience' in the chunk and then print out the text after it
+    y = [y[y.lower().index('experience') + 10:] for j, y in enumerate(chunks) if y and 'experience' in y.lower()]
+
+    x.extend(y)
+
+    return x
+
+def extract_experience(resume_text, language=None):
+    '''
+    Helper function to extract experience from resume text with NLTK.
+    Kept to compare against `extract_experience_from_doc`, which reuses the spaCy Doc.
 
     :param resume_text: Plain resume text
+    :param language: language of the resume, None to drop the stopwords of every language
     :return: list of experience
     '''
     wordnet_lemmatizer = WordNetLemmatizer()
-    stop_words = set(stopwords.words('english') + stopwords.words('french'))
+    stop_words = experience_stopwords(language)
 
     # word tokenization
     word_tokens = nltk.word_tokenize(resume_text)
@@ -274,28 +569,39 @@ def extract_experience(resume_text):
     cp = nltk.RegexpParser('P: {<NNP>+}')
     cs = cp.parse(sent)
 
-    # for i in cs.subtrees(filter=lambda x: x.label() == 'P'):
-    #     print(i)
-
     test = []
 
     for vp in list(cs.subtrees(filter=lambda x: x.label()=='P')):
         test.append(" ".join([i[0] for i in vp.leaves() if len(vp.leaves()) >= 2]))
 
-    # Search the words ['expérience', 'professionnelle', 'stage', 'stagiaire', 'internship', 'intern', 'experience', 'professional experience'] in the chunk and then print out the text after it
+    return _experience_from_chunks(test)
 
-    experience_keywords = ['expérience', 'professionnelle', 'stage', 'stagiaire', 'internship', 'intern', 'experience', 'professional experience']
-    x = []
-    for i in test:
-        if any(word in i.lower() for word in experience_keywords):
-            x.append(i)
-
-    # Search the word 'experience' in the chunk and then print out the text after it
-    y = [y[y.lower().index('experience') + 10:] for j, y in enumerate(test) if y and 'experience' in y.lower()]
-
-    x.extend(y)
+def extract_experience_from_doc(nlp_text, language=None):
+    '''
+    Helper function to extract experience from the spaCy Doc already built for
+    the resume: runs of proper nouns (stopwords removed) play the part of the
+    NLTK `<NNP>+` chunks, so no second tokenization / tagging pass is needed.
 
-    return x
+    :param nlp_text: object of `spacy.tokens.doc.Doc`
+    :param language: language of the resume, None for the language of the Doc's model
+    :return: list of experience
+    '''
+    stop_words = experience_stopwords(language or nlp_text.lang_)
+    chunks = []
+    current = []
+    for token in nlp_text:
+        if token.is_space or token.text in stop_words or token.lemma_ in stop_words:
+            continue
+        if token.pos_ == 'PROPN':
+            current.append(token.text)
+        elif current:
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+
+    # like the NLTK chunker, single proper nouns give an empty chunk
+    return _experience_from_chunks([' '.join(chunk) if len(chunk) >= 2 else '' for chunk in chunks])
 
 # def extract_experience(doc):
 #     """
@@ -362,49 +668,83 @@ def extract_experience(resume_text):
 #     return experience_details
 
 
-def extract_competencies(text, experience_list):
+class PhraseLexicon(object):
+    '''
+    A `{category: [phrase, ...]}` dictionary compiled to be matched in a single
+    pass over a text, with the same `\\b<phrase>\\b` semantics as `string_found`.
+
+    Every word-initial phrase is indexed by its first run of word characters.
+    A phrase can only match where that exact run starts in the text, so the
+    text is scanned once for word runs and only the few phrases sharing the
+    run are verified with an anchored regex.
+    '''
+
+    def __init__(self, lexicon):
+        self.__entries = [(category, phrase) for category, phrases in lexicon.items() for phrase in phrases]
+        self.__by_first_word = {}
+        self.__fallback = {}
+        for category, phrase in self.__entries:
+            first_word = _WORD.match(phrase)
+            if first_word:
+                patterns = self.__by_first_word.setdefault(first_word.group(), {})
+                patterns[phrase] = re.compile(re.escape(phrase) + r"\b")
+            else:
+                # e.g. '$ ' or '%', fall back to a regular search
+                self.__fallback[phrase] = re.compile(r"\b" + re.escape(phrase) + r"\b")
+
+    def find(self, text):
+        '''
+        :param text: text to scan
+        :return: dictionary of category -> phrases found, in lexicon order
+        '''
+        found = set()
+        for word in _WORD.finditer(text):
+            for phrase, pattern in self.__by_first_word.get(word.group(), {}).items():
+                if phrase not in found and pattern.match(text, word.start()):
+                    found.add(phrase)
+        for phrase, pattern in self.__fallback.items():
+            if pattern.search(text):
+                found.add(phrase)
+
+        matches = {}
+        for category, phrase in self.__entries:
+            if phrase in found:
+                matches.setdefault(category, []).append(phrase)
+        return matches
+
+
+_WORD = re.compile(r"\w+")
+COMPETENCIES_LEXICONS = {language: PhraseLexicon(lexicon)
+                         for language, lexicon in cs.COMPETENCIES_BY_LANGUAGE.items()}
+MEASURABLE_RESULTS_LEXICONS = {language: PhraseLexicon(lexicon)
+                               for language, lexicon in cs.MEASURABLE_RESULTS_BY_LANGUAGE.items()}
+
+
+def extract_competencies(text, experience_list, language=cs.DEFAULT_LANGUAGE):
     '''
     Helper function to extract competencies from resume text
 
     :param resume_text: Plain resume text
+    :param language: key of `constants.COMPETENCIES_BY_LANGUAGE`
     :return: dictionary of competencies
     '''
     experience_text = ' '.join(experience_list)
-    competency_dict = {}
-
-    for competency in cs.COMPETENCIES.keys():
-        for item in cs.COMPETENCIES[competency]:
-            if string_found(item, experience_text):
-                if competency not in competency_dict.keys():
-                    competency_dict[competency] = [item]
-                else:
-                    competency_dict[competency].append(item)
-    
-    return competency_dict
+    return COMPETENCIES_LEXICONS[language].find(experience_text)
 
-def extract_measurable_results(text, experience_list):
+def extract_measurable_results(text, experience_list, language=cs.DEFAULT_LANGUAGE):
     '''
     Helper function to extract measurable results from resume text
 
     :param resume_text: Plain resume text
+    :param language: key of `constants.MEASURABLE_RESULTS_BY_LANGUAGE`
     :return: dictionary of measurable results
     '''
 
     # we scan for measurable results only in first half of each sentence
     experience_text = ' '.join([text[:len(text) // 2 - 1] for text in experience_list])
-    mr_dict = {}
-
-    for mr in cs.MEASURABLE_RESULTS.keys():
-        for item in cs.MEASURABLE_RESULTS[mr]:
-            if string_found(item, experience_text):
-                if mr not in mr_dict.keys():
-                    mr_dict[mr] = [item]
-                else:
-                    mr_dict[mr].append(item)
-    
-    return mr_dict
+    return MEASURABLE_RESULTS_LEXICONS[language].find(experience_text)
 
 def string_found(string1, string2):
     if re.search(r"\b" + re.escape(string1) + r"\b", string2):
         return True
-    return False
\ No newline at end of file
+    return False
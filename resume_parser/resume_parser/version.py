@@ -0,0 +1,5 @@
+# Bump whenever extraction output can change (text extraction, extractors,
+# constants, the spaCy pipeline or model routing), so cached results are
+# invalidated and `reparse_resumes` finds the stored fields stale. The golden
+# tests in parser_app/tests.py fail until the new output is recorded.
+PARSER_VERSION = '2026.10.2'